@@ -16,44 +16,98 @@
 #
 
 import os
+import sys
 import socket
 import threading
 import time
 import uuid
 import psutil
 import json
-import re
 import SharedTableBroker
 import weakref
 import struct
+import selectors
+import codecs
+import asyncio
+import queue
+import itertools
+import fnmatch
+import collections
+import heapq
+import array
+import bisect
+import logging
+import re
 
 if os.name != 'nt':
     from pyroute2 import IPRoute
+    from pyroute2.netlink.rtnl import RTMGRP_IPV4_ROUTE, RTMGRP_IPV4_IFADDR
 
 if not hasattr(socket, "IP_ADD_SOURCE_MEMBERSHIP"):
     setattr(socket, "IP_ADD_SOURCE_MEMBERSHIP", 39)
 
+if not hasattr(socket, "SO_TIMESTAMPNS") and sys.platform.startswith("linux"):
+    setattr(socket, "SO_TIMESTAMPNS", 35)
+
 
 version = "0.5.5"
 
 
+logger = logging.getLogger(__name__)
+
+
 class constants():
     BROKER_SERVICE_NAME = "D2D_TABLE"
     BROKER_PORT = 18832
     CLIENT_DISCOVER_WAIT = 5
     MTU = 500
+    TCP_READ_SIZE = 65536
+    UDP_READ_SIZE = 65535
+    FRAGMENT_HEADER = struct.Struct("!BIHH")
+    FRAGMENT_MARKER = 0xFF
+    FRAGMENT_TIMEOUT = 5
+    FRAGMENT_MAX_PENDING = 1024
+    FRAGMENT_MAX_SOURCE_PENDING = 64
+    FRAME_HEADER = struct.Struct("!I")
+    MAX_FRAME_SIZE = 16 * 1024 * 1024
     END_OF_TX = b'\xFF'
     MAX_LISTEN_TCP_SOKETS = -1
     MQTT_PREFIX = "d2dcn"
     PREFIX = "d2dcn"
     COMMAND_LEVEL = "command"
+    BUNDLE_LEVEL = "bundle"
+    BUNDLE_MAX_SIZE = 4096
     INFO_LEVEL = "info"
     STATE = "state"
     INFO_MULTICAST_GROUP = "232.10.10.10"
     INFO_REQUEST = b"req"
+    INFO_REQUEST_TIMEOUT = 1
+    INFO_REQUEST_RETRIES = 3
+    INFO_SNAPSHOT_MAX_FRAMES = 64
+    INFO_HEADER = struct.Struct("<I")
+    INFO_FRAME_ID = 0xFFFFFFFF
+    INFO_FRAME_ENTRY = struct.Struct("<II")
+    INFO_FRAME_PART = struct.Struct("<IHH")
+    INFO_FRAME_SIZE = 16384
+    INFO_FRAME_TIMEOUT = 1
+    INFO_FRAME_MAX_PENDING = 64
+    INFO_TIMESTAMP = struct.Struct("<d")
+    INFO_SEQUENCE = struct.Struct("<I")
+    INFO_SEQUENCE_MASK = 0xFFFFFFFF
+    KERNEL_TIMESTAMP = struct.Struct("@ll")
     TX_TIMEOUT = 0.1
     TX_TIMEOUT_MAX_COUNT = 50
     RX_TIMEOUT = 0.1
+    READER_PARK_CHECK = 1
+    TRANSPORT_IDLE_TIME = 60
+    TRANSPORT_IDLE_CHECK = 1
+    INFO_STREAM_QUEUE_SIZE = 256
+    METRICS_LATENCY_BUCKETS = (0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+    COMMAND_QUEUE_SIZE = 128
+    CALLBACK_QUEUE_SIZE = 16
+    CALLBACK_WORKERS = 8
+    INDEX_RESYNC_TIME = 30
+    DESCRIPTOR_CACHE_SIZE = 4096
 
     class state:
         OFFLINE = "offline"
@@ -82,6 +136,13 @@ class constants():
         OUTPUT = "output"
         ENABLE = "enable"
         TIMEOUT = "timeout"
+        MTU = "mtu"
+
+    class envelopeField():
+        ID = "id"
+        ARGS = "args"
+        RESPONSE = "response"
+        ERROR = "error"
 
     class infoField():
         PROTOCOL = "protocol"
@@ -89,13 +150,16 @@ class constants():
         REQUEST_PORT = "req_port"
         UPDATE_PORT = "update_port"
         TYPE = "type"
+        ID = "id"
 
     class commandProtocol():
         JSON_UDP = "json-udp"
         JSON_TCP = "json-tcp"
+        JSON_TCP_FRAMED = "json-tcp-framed"
 
     class infoProtocol():
         ASCII = "ASCII"
+        BINARY = "BINARY"
 
     class field():
         TYPE = "type"
@@ -117,6 +181,255 @@ class container():
     pass
 
 
+class frameBuffer():
+
+    def __init__(self):
+        self.__buffer = bytearray()
+
+
+    def frame(msg):
+        if isinstance(msg, str):
+            msg = msg.encode()
+        return constants.FRAME_HEADER.pack(len(msg)) + msg
+
+
+    def push(self, data):
+        self.__buffer += data
+
+
+    def pop(self):
+
+        if len(self.__buffer) < constants.FRAME_HEADER.size:
+            return None
+
+        # The stream can not be resynchronized after a corrupted header
+        frame_size = constants.FRAME_HEADER.unpack_from(self.__buffer)[0]
+        if frame_size > constants.MAX_FRAME_SIZE:
+            raise ValueError("Frame too big")
+
+        frame_end = constants.FRAME_HEADER.size + frame_size
+        if len(self.__buffer) < frame_end:
+            return None
+
+        frame = bytes(self.__buffer[constants.FRAME_HEADER.size:frame_end])
+        del self.__buffer[:frame_end]
+        return frame
+
+
+    def clear(self):
+        self.__buffer = bytearray()
+
+
+class jsonBuffer():
+
+    __TOKEN = re.compile(r'[^,:\s0-9+\-.eEtruefalsn]')
+    __STRING = re.compile(r'["\\]')
+
+    def __init__(self):
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.clear()
+
+
+    def push(self, data):
+
+        # Consumed messages are dropped when new data arrives
+        self.__buffer = self.__buffer[self.__start:] + self.__decoder.decode(data)
+        self.__scan -= self.__start
+        self.__start = 0
+
+
+    def pop(self):
+
+        while True:
+
+            # Discard anything that is not an object
+            if self.__depth == 0:
+                start = self.__buffer.find("{", self.__scan)
+                if start < 0:
+                    self.__buffer = ""
+                    self.__start = 0
+                    self.__scan = 0
+                    return None
+
+                self.__start = start
+                self.__scan = start + 1
+                self.__depth = 1
+
+            end = self.__scanObject()
+            if end == None:
+                return None
+
+            # Invalid input, resync at the next object
+            if end < 0:
+                self.__scan = self.__start + 1
+                self.__depth = 0
+                self.__string = False
+                continue
+
+            msg = self.__buffer[self.__start:end]
+            self.__start = end
+            return msg
+
+
+    def __scanObject(self):
+
+        # Bytes already examined are not scanned again
+        buffer = self.__buffer
+        pos = self.__scan
+        while True:
+            if self.__string:
+                match = jsonBuffer.__STRING.search(buffer, pos)
+                if match == None:
+                    self.__scan = len(buffer)
+                    return None
+
+                pos = match.end()
+                if match.group() == '"':
+                    self.__string = False
+
+                elif pos < len(buffer):
+                    pos += 1
+
+                else:
+                    self.__scan = match.start()
+                    return None
+
+                continue
+
+            match = jsonBuffer.__TOKEN.search(buffer, pos)
+            if match == None:
+                self.__scan = len(buffer)
+                return None
+
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                self.__string = True
+
+            elif char == "{" or char == "[":
+                previous = match.start() - 1
+                while buffer[previous].isspace():
+                    previous -= 1
+
+                if buffer[previous] not in ":,[":
+                    return -1
+
+                self.__depth += 1
+
+            elif char == "}" or char == "]":
+                self.__depth -= 1
+                if self.__depth == 0:
+                    self.__scan = pos
+                    return pos
+
+            else:
+                return -1
+
+
+    def clear(self):
+        self.__decoder.reset()
+        self.__buffer = ""
+        self.__start = 0
+        self.__scan = 0
+        self.__depth = 0
+        self.__string = False
+
+
+class fragmentBuffer():
+
+    __next_id = itertools.count()
+
+    def __init__(self):
+        self.__messages = collections.OrderedDict()
+        self.__sources = {}
+
+
+    def fragment(msg, mtu=None):
+        if isinstance(msg, str):
+            msg = msg.encode()
+
+        if mtu == None:
+            mtu = constants.MTU
+
+        if len(msg) <= mtu:
+            return [msg]
+
+        size = mtu - constants.FRAGMENT_HEADER.size
+        count = (len(msg) + size - 1) // size
+        if size <= 0 or count > 0xFFFF:
+            return []
+
+        msg_id = next(fragmentBuffer.__next_id) & 0xFFFFFFFF
+        return [constants.FRAGMENT_HEADER.pack(constants.FRAGMENT_MARKER, msg_id, index, count) + msg[index * size:(index + 1) * size] for index in range(count)]
+
+
+    def push(self, data, source):
+
+        # Not fragmented messages are returned as they are (utf-8 never contains the marker)
+        if len(data) < constants.FRAGMENT_HEADER.size or data[0] != constants.FRAGMENT_MARKER:
+            return data
+
+        _, msg_id, index, count = constants.FRAGMENT_HEADER.unpack_from(data)
+        if index >= count:
+            return None
+
+
+        # Drop incomplete messages, oldest first
+        current_time = time.time()
+        while len(self.__messages) > 0:
+            key, message = next(iter(self.__messages.items()))
+            if current_time - message.time <= constants.FRAGMENT_TIMEOUT:
+                break
+
+            self.__drop(key)
+
+
+        key = (source, msg_id)
+        message = self.__messages.get(key)
+        if message == None:
+            pending = self.__sources.get(source)
+            if pending != None and len(pending) >= constants.FRAGMENT_MAX_SOURCE_PENDING:
+                self.__drop(next(iter(pending)))
+
+            if len(self.__messages) >= constants.FRAGMENT_MAX_PENDING:
+                self.__drop(next(iter(self.__messages)))
+
+            message = container()
+            message.time = current_time
+            message.count = count
+            message.fragments = {}
+            self.__messages[key] = message
+            self.__sources.setdefault(source, collections.OrderedDict())[key] = None
+
+        elif message.count != count:
+            return None
+
+        message.fragments[index] = data[constants.FRAGMENT_HEADER.size:]
+        if len(message.fragments) < message.count:
+            return None
+
+        self.__drop(key)
+        return b"".join(message.fragments[index] for index in range(message.count))
+
+
+    def __drop(self, key):
+        del self.__messages[key]
+        pending = self.__sources[key[0]]
+        del pending[key]
+        if len(pending) == 0:
+            del self.__sources[key[0]]
+
+
+    @property
+    def pending(self):
+        return len(self.__messages)
+
+
+    def clear(self):
+        self.__messages = collections.OrderedDict()
+        self.__sources = {}
+
+
 class mcast():
 
     def __init__(self, ip:str, port:int=0, src:str=""):
@@ -141,6 +454,16 @@ class mcast():
 
         self.__port = self.__sock.getsockname()[1]
 
+        # Kernel receive timestamps
+        self.__timestamps = False
+        if hasattr(socket, "SO_TIMESTAMPNS") and hasattr(self.__sock, "recvmsg"):
+            try:
+                self.__sock.setsockopt(socket.SOL_SOCKET, socket.SO_TIMESTAMPNS, 1)
+                self.__timestamps = True
+
+            except:
+                pass
+
 
     def __del__(self):
         self.close()
@@ -151,12 +474,16 @@ class mcast():
         return self.__port
 
 
+    def fileno(self):
+        return self.__sock.fileno()
+
+
     def read(self, timeout=-1):
 
         current_epoch_time = float(time.time())
         while self.__open:
             try:
-                data, (ip, port) = self.__sock.recvfrom(4096)
+                data, (ip, port) = self.__sock.recvfrom(constants.UDP_READ_SIZE)
                 return data, ip, port
 
             except socket.timeout:
@@ -170,6 +497,34 @@ class mcast():
         return None, None, None
 
 
+    def readStamped(self, timeout=-1):
+
+        if not self.__timestamps:
+            data, ip, port = self.read(timeout)
+            return data, ip, port, time.time()
+
+        current_epoch_time = float(time.time())
+        while self.__open:
+            try:
+                data, ancdata, flags, (ip, port) = self.__sock.recvmsg(constants.UDP_READ_SIZE, socket.CMSG_SPACE(constants.KERNEL_TIMESTAMP.size))
+                for level, cmsg_type, cmsg_data in ancdata:
+                    if level == socket.SOL_SOCKET and cmsg_type == socket.SO_TIMESTAMPNS and len(cmsg_data) >= constants.KERNEL_TIMESTAMP.size:
+                        sec, nsec = constants.KERNEL_TIMESTAMP.unpack_from(cmsg_data)
+                        return data, ip, port, sec + nsec / 1e9
+
+                return data, ip, port, time.time()
+
+            except socket.timeout:
+                if timeout >= 0 and float(time.time()) - current_epoch_time >= timeout:
+                    return None, None, None, None
+
+            except socket.error:
+                return None, None, None, None
+
+
+        return None, None, None, None
+
+
     def send(self, msg):
         if isinstance(msg, str):
             msg = msg.encode()
@@ -195,6 +550,7 @@ class udpRandomPortListener():
         self.__sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.__sock.bind(('', 0))
         self.__sock.settimeout(constants.RX_TIMEOUT)
+        self.__fragment_buffer = fragmentBuffer()
 
 
     def __del__(self):
@@ -206,7 +562,7 @@ class udpRandomPortListener():
         current_epoch_time = int(time.time())
         while self.__open:
             try:
-                data, (ip, port) = self.__sock.recvfrom(constants.MTU)
+                data, (ip, port) = self.__sock.recvfrom(constants.UDP_READ_SIZE)
                 return data, ip, port
 
             except socket.timeout:
@@ -244,11 +600,39 @@ class udpRandomPortListener():
         return True
 
 
+    def readMessage(self, timeout=-1):
+
+        while True:
+            data, ip, port = self.read(timeout)
+            if data == None:
+                return None, None, None
+
+            msg = self.__fragment_buffer.push(data, (ip, port))
+            if msg != None:
+                return msg, ip, port
+
+
+    def sendMessage(self, ip, port, msg, mtu=None):
+        fragments = fragmentBuffer.fragment(msg, mtu)
+        if len(fragments) == 0:
+            return False
+
+        for fragment in fragments:
+            if not self.send(ip, port, fragment):
+                return False
+
+        return True
+
+
     @property
     def port(self):
         return self.__sock.getsockname()[1]
 
 
+    def fileno(self):
+        return self.__sock.fileno()
+
+
     def close(self):
         self.__open = False
         self.__sock.close()
@@ -261,6 +645,7 @@ class udpClient():
         self.__remote_port = port
         self.__sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.__sock.settimeout(constants.RX_TIMEOUT)
+        self.__fragment_buffer = fragmentBuffer()
 
 
     def __del__(self):
@@ -272,7 +657,7 @@ class udpClient():
         current_epoch_time = int(time.time())
         while self.__open:
             try:
-                data = self.__sock.recv(constants.MTU)
+                data = self.__sock.recv(constants.UDP_READ_SIZE)
                 return data
 
             except socket.timeout:
@@ -310,6 +695,30 @@ class udpClient():
         return True
 
 
+    def readMessage(self, timeout=-1):
+
+        while True:
+            data = self.read(timeout)
+            if data == None:
+                return None
+
+            msg = self.__fragment_buffer.push(data, None)
+            if msg != None:
+                return msg
+
+
+    def sendMessage(self, msg, mtu=None):
+        fragments = fragmentBuffer.fragment(msg, mtu)
+        if len(fragments) == 0:
+            return False
+
+        for fragment in fragments:
+            if not self.send(fragment):
+                return False
+
+        return True
+
+
     @property
     def local_ip(self):
         hostname = socket.gethostname()
@@ -346,15 +755,16 @@ class tcpListener():
             self.__ip = ip
             self.__port = port
             self.__open = True
+            self.__frames = frameBuffer()
             self.__sock.settimeout(constants.RX_TIMEOUT)
 
 
-        def read(self, timeout=-1):
+        def read(self, timeout=-1, size=constants.MTU):
 
             current_epoch_time = int(time.time())
             while self.__open:
                 try:
-                    data = self.__sock.recv(constants.MTU)
+                    data = self.__sock.recv(size)
 
                     if len(data) > 0:
                         return data
@@ -374,6 +784,32 @@ class tcpListener():
                     return None
 
 
+        def readFrame(self, timeout=-1):
+
+            current_epoch_time = time.time()
+            while True:
+                try:
+                    frame = self.__frames.pop()
+
+                except ValueError:
+                    self.close()
+                    return None
+
+                if frame != None:
+                    return frame
+
+                remaining_time = -1 if timeout < 0 else max(0, timeout - (time.time() - current_epoch_time))
+                data = self.read(remaining_time, constants.TCP_READ_SIZE)
+                if data == None:
+                    return None
+
+                self.__frames.push(data)
+
+
+        def sendFrame(self, msg):
+            return self.send(frameBuffer.frame(msg))
+
+
         def send(self, msg):
             if isinstance(msg, str):
                 msg = msg.encode()
@@ -469,6 +905,7 @@ class tcpClient():
         self.__open = False
         self.__remote_ip = ip
         self.__remote_port = port
+        self.__frames = frameBuffer()
         self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.__sock.settimeout(constants.RX_TIMEOUT)
 
@@ -479,18 +916,29 @@ class tcpClient():
 
     def connect(self):
         if not self.__open:
+
+            # Closed sockets can not be reconnected
+            if self.__sock.fileno() < 0:
+                self.__sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.__sock.settimeout(constants.RX_TIMEOUT)
+
             self.__open = self.__sock.connect_ex((self.__remote_ip, self.__remote_port)) == 0
         return self.__open
 
 
-    def read(self, timeout=-1):
+    def read(self, timeout=-1, size=constants.MTU):
 
         if self.connect():
             current_epoch_time = int(time.time())
             while self.__open:
                 try:
-                    data = self.__sock.recv(constants.MTU)
-                    return data
+                    data = self.__sock.recv(size)
+                    if len(data) > 0:
+                        return data
+
+                    else:
+                        self.close()
+                        return None
 
                 except socket.timeout:
                     if timeout >= 0 and int(time.time()) - current_epoch_time >= timeout:
@@ -498,12 +946,37 @@ class tcpClient():
 
                 except socket.error:
                     self.close()
-                    if not self.__connect():
-                        return None
+                    return None
 
         return None
 
 
+    def readFrame(self, timeout=-1):
+
+        current_epoch_time = time.time()
+        while True:
+            try:
+                frame = self.__frames.pop()
+
+            except ValueError:
+                self.close()
+                return None
+
+            if frame != None:
+                return frame
+
+            remaining_time = -1 if timeout < 0 else max(0, timeout - (time.time() - current_epoch_time))
+            data = self.read(remaining_time, constants.TCP_READ_SIZE)
+            if data == None:
+                return None
+
+            self.__frames.push(data)
+
+
+    def sendFrame(self, msg):
+        return self.send(frameBuffer.frame(msg))
+
+
     def send(self, msg):
         if self.connect():
 
@@ -526,9 +999,12 @@ class tcpClient():
                         time.sleep(constants.TX_TIMEOUT)
 
                 except:
+                    self.close()
                     return False
 
-        return True
+            return True
+
+        return False
 
 
     @property
@@ -559,6 +1035,7 @@ class tcpClient():
 
     def close(self):
         self.__open = False
+        self.__frames.clear()
         self.__sock.close()
 
 
@@ -626,6 +1103,28 @@ class typeTools():
             return False
 
 
+    def compileTypeCheck(field_type):
+
+        basic_checks = {}
+        basic_checks[constants.valueTypes.FLOAT] = lambda value : isinstance(value, float)
+        basic_checks[constants.valueTypes.BOOL] = lambda value : isinstance(value, bool)
+        basic_checks[constants.valueTypes.INT] = lambda value : isinstance(value, int) and not isinstance(value, bool)
+        basic_checks[constants.valueTypes.STRING] = lambda value : isinstance(value, str)
+
+        if field_type in basic_checks:
+            return basic_checks[field_type]
+
+        elif field_type == constants.valueTypes.ARRAY:
+            return lambda value : isinstance(value, list) and len(value) == 0
+
+        elif field_type.endswith("_" + constants.valueTypes.ARRAY) and field_type[:-len(constants.valueTypes.ARRAY) - 1] in basic_checks:
+            item_check = basic_checks[field_type[:-len(constants.valueTypes.ARRAY) - 1]]
+            return lambda value : isinstance(value, list) and all(map(item_check, value))
+
+        else:
+            return lambda value : typeTools.checkFieldType(value, field_type)
+
+
     def convevertFromASCII(data, data_type):
 
         try:
@@ -694,64 +1193,460 @@ class typeTools():
             return None
 
 
-class commandArgsDef(dict):
+    def convertFromBinary(data, data_type):
 
-    def __init__(self, data={}):
-        super().__init__()
+        try:
+            if data_type == constants.valueTypes.BOOL:
+                return struct.unpack("<?", data)[0]
 
-        if len(data) > 0:
-            for it in data:
-                self[it] = data[it]
-            self.__editable = False
+            elif data_type == constants.valueTypes.INT:
+                return struct.unpack("<q", data)[0]
 
-        else:
-            self.__editable = True
+            elif data_type == constants.valueTypes.STRING:
+                return data.decode()
 
+            elif data_type == constants.valueTypes.FLOAT:
+                return struct.unpack("<d", data)[0]
 
-    def add(self, arg_name:str, arg_type:str, optional:bool=False):
-        if self.__editable:
-            self[arg_name] = {}
-            self[arg_name][constants.field.TYPE] = arg_type
+            elif data_type == constants.valueTypes.BOOL_ARRAY:
+                return list(struct.unpack("<%d?" % len(data), data))
 
-            if optional:
-                self[arg_name][constants.field.OPTIONAL] = optional
-            return True
+            elif data_type == constants.valueTypes.INT_ARRAY:
+                return list(struct.unpack("<%dq" % (len(data) // 8), data))
 
-        else:
-            return False
+            elif data_type == constants.valueTypes.FLOAT_ARRAY:
+                return list(struct.unpack("<%dd" % (len(data) // 8), data))
 
-    @property
-    def names(self):
-        return self.keys()
+            elif data_type == constants.valueTypes.STRING_ARRAY:
 
+                # Each item is prefixed with its length
+                rl = []
+                offset = 0
+                while offset < len(data):
+                    item_size = struct.unpack_from("<I", data, offset)[0]
+                    offset += 4
+                    if offset + item_size > len(data):
+                        return None
 
-    def getArgType(self, name):
-        return self[name][constants.field.TYPE] if name in self else None
+                    rl.append(data[offset:offset + item_size].decode())
+                    offset += item_size
 
+                return rl
 
-    def isArgOptional(self, name):
-        return self[name][constants.field.OPTIONAL] if name in self and constants.field.OPTIONAL in self[name] else False
+            elif data_type == constants.valueTypes.ARRAY:
+                return []
 
+            else:
+                return None
 
-class commandResponse(dict):
+        except:
+            return None
 
-    def __init__(self, str_response):
-        super().__init__()
 
+    def convertToBinary(data, data_type):
         try:
-            response_dict = json.loads(str_response)
-            for item in response_dict:
-                self[item] = response_dict[item]
-            self.__success = True
-            self.__error = None
+            if data_type == constants.valueTypes.BOOL:
+                return struct.pack("<?", data)
 
+            elif data_type == constants.valueTypes.INT:
+                return struct.pack("<q", data)
+
+            elif data_type == constants.valueTypes.STRING:
+                return str(data).encode()
+
+            elif data_type == constants.valueTypes.FLOAT:
+                return struct.pack("<d", data)
+
+            elif data_type == constants.valueTypes.ARRAY or constants.valueTypes.ARRAY in data_type:
+                if not isinstance(data, list):
+                    return None
+
+                if data_type == constants.valueTypes.BOOL_ARRAY:
+                    return struct.pack("<%d?" % len(data), *data)
+
+                elif data_type == constants.valueTypes.INT_ARRAY:
+                    return struct.pack("<%dq" % len(data), *data)
+
+                elif data_type == constants.valueTypes.FLOAT_ARRAY:
+                    return struct.pack("<%dd" % len(data), *data)
+
+                elif data_type == constants.valueTypes.STRING_ARRAY:
+                    rb = bytearray()
+                    for item in data:
+                        item = str(item).encode()
+                        rb += struct.pack("<I", len(item))
+                        rb += item
+                    return bytes(rb)
+
+                elif data_type == constants.valueTypes.ARRAY and len(data) == 0:
+                    return b""
+
+                else:
+                    return None
+
+            else:
+                return None
+
+        except:
+            return None
+
+
+    def encode(data, data_type, protocol):
+
+        if protocol == constants.infoProtocol.BINARY:
+            return typeTools.convertToBinary(data, data_type)
+
+        elif protocol == constants.infoProtocol.ASCII:
+            data = typeTools.convertToASCII(data, data_type)
+            return data.encode() if data != None else None
+
+        else:
+            return None
+
+
+    def decode(data, data_type, protocol):
+
+        if protocol == constants.infoProtocol.BINARY:
+            return typeTools.convertFromBinary(data, data_type)
+
+        elif protocol == constants.infoProtocol.ASCII:
+            try:
+                return typeTools.convevertFromASCII(data.decode(), data_type)
+
+            except:
+                return None
+
+        else:
+            return None
+
+
+class metricsRegistry():
+
+    __instance = None
+    __instance_mutex = threading.Lock()
+
+
+    def get():
+        if metricsRegistry.__instance == None:
+            with metricsRegistry.__instance_mutex:
+                if metricsRegistry.__instance == None:
+                    metricsRegistry.__instance = metricsRegistry()
+
+        return metricsRegistry.__instance
+
+
+    def __init__(self):
+        self.__shared = container()
+        self.__shared.mutex = threading.Lock()
+        self.__shared.shards = []
+        self.__shared.retired = metricsRegistry.__newShard()
+        self.__local = threading.local()
+
+
+    def __newShard():
+        shard = container()
+        shard.counters = {}
+        shard.histograms = {}
+        return shard
+
+
+    def __merge(target, shard):
+
+        for key, value in shard.counters.copy().items():
+            target.counters[key] = target.counters.get(key, 0) + value
+
+        for key, histogram in shard.histograms.copy().items():
+            if key not in target.histograms:
+                target.histograms[key] = [0, 0.0] + [0] * (len(constants.METRICS_LATENCY_BUCKETS) + 1)
+
+            target.histograms[key] = [a + b for a, b in zip(target.histograms[key], histogram)]
+
+
+    def __retire(shared, shard):
+
+        # The thread is gone, so its shard will not change anymore
+        with shared.mutex:
+            metricsRegistry.__merge(shared.retired, shard)
+            shared.shards.remove(shard)
+
+
+    def __shard(self):
+
+        # Each thread only writes its own shard
+        try:
+            return self.__local.owner.shard
+
+        except AttributeError:
+            owner = container()
+            owner.shard = metricsRegistry.__newShard()
+            with self.__shared.mutex:
+                self.__shared.shards.append(owner.shard)
+
+            # Thread local data is released when the thread ends
+            weakref.finalize(owner, metricsRegistry.__retire, self.__shared, owner.shard)
+            self.__local.owner = owner
+            return owner.shard
+
+
+    @property
+    def shards(self) -> int:
+        with self.__shared.mutex:
+            return len(self.__shared.shards)
+
+
+    def count(self, name, labels, amount=1):
+        counters = self.__shard().counters
+        key = (name, labels)
+        counters[key] = counters.get(key, 0) + amount
+
+
+    def observe(self, name, labels, value):
+        histograms = self.__shard().histograms
+        key = (name, labels)
+        histogram = histograms.get(key)
+        if histogram == None:
+            histogram = [0, 0.0] + [0] * (len(constants.METRICS_LATENCY_BUCKETS) + 1)
+            histograms[key] = histogram
+
+        histogram[0] += 1
+        histogram[1] += value
+        histogram[2 + bisect.bisect_left(constants.METRICS_LATENCY_BUCKETS, value)] += 1
+
+
+    def snapshot(self) -> dict:
+
+        total = metricsRegistry.__newShard()
+        with self.__shared.mutex:
+            metricsRegistry.__merge(total, self.__shared.retired)
+            for shard in self.__shared.shards:
+                metricsRegistry.__merge(total, shard)
+
+        counters = {}
+        histograms = {}
+        for (name, labels), value in total.counters.items():
+            label = "/".join(str(label) for label in labels)
+            counters.setdefault(name, {})
+            counters[name][label] = counters[name].get(label, 0) + value
+
+        for (name, labels), histogram in total.histograms.items():
+            label = "/".join(str(label) for label in labels)
+            histograms.setdefault(name, {})
+            if label not in histograms[name]:
+                histograms[name][label] = [0, 0.0] + [0] * (len(constants.METRICS_LATENCY_BUCKETS) + 1)
+
+            histograms[name][label] = [a + b for a, b in zip(histograms[name][label], histogram)]
+
+        bounds = [str(bound) for bound in constants.METRICS_LATENCY_BUCKETS] + ["inf"]
+        for name in histograms:
+            for label, histogram in histograms[name].items():
+                histograms[name][label] = {"count" : histogram[0], "sum" : histogram[1], "buckets" : dict(zip(bounds, histogram[2:]))}
+
+        return {"time" : time.time(), "counters" : counters, "histograms" : histograms}
+
+
+    def export(self) -> str:
+        return json.dumps(self.snapshot())
+
+
+class commandDispatcher():
+
+    def __init__(self, workers=1, queue_size=constants.COMMAND_QUEUE_SIZE):
+        self.__shared = container()
+        self.__shared.queue = queue.Queue(queue_size)
+        self.__shared.mutex = threading.Lock()
+        self.__shared.dropped = 0
+        self.__shared.max_depth = 0
+        self.__threads = []
+
+        for i in range(max(1, workers)):
+            thread = threading.Thread(target=commandDispatcher.__workerThread, daemon=True, args=[self.__shared])
+            thread.start()
+            self.__threads.append(thread)
+
+
+    def __del__(self):
+        self.stop()
+
+
+    @property
+    def workers(self):
+        return len(self.__threads)
+
+
+    @property
+    def depth(self):
+        return self.__shared.queue.qsize()
+
+
+    @property
+    def capacity(self):
+        return self.__shared.queue.maxsize
+
+
+    @property
+    def maxDepth(self):
+        with self.__shared.mutex:
+            return self.__shared.max_depth
+
+
+    @property
+    def dropped(self):
+        with self.__shared.mutex:
+            return self.__shared.dropped
+
+
+    def submit(self, task, block=True) -> bool:
+        try:
+            self.__shared.queue.put(task, block)
+
+            # Peak depth observed at enqueue time
+            depth = self.__shared.queue.qsize()
+            with self.__shared.mutex:
+                self.__shared.max_depth = max(self.__shared.max_depth, depth)
+            return True
+
+        except queue.Full:
+            with self.__shared.mutex:
+                self.__shared.dropped += 1
+            return False
+
+
+    def stop(self):
+        for thread in self.__threads:
+            self.__shared.queue.put(None)
+
+        for thread in self.__threads:
+            thread.join()
+
+        self.__threads = []
+
+
+    def __workerThread(shared):
+
+        while True:
+            task = shared.queue.get()
+            if task == None:
+                break
+
+            try:
+                task()
+
+            except:
+                pass
+
+
+class commandArgsDef(dict):
+
+    __interned = weakref.WeakValueDictionary()
+    __interned_mutex = threading.Lock()
+
+    def __init__(self, data={}):
+        super().__init__()
+
+        if len(data) > 0:
+            for it in data:
+                self[it] = data[it]
+            self.__editable = False
+
+        else:
+            self.__editable = True
+
+        self.__validator = commandArgsDef.compile(self)
+
+
+    def compile(args_def):
+
+        checks = {}
+        required = []
+        for name in args_def:
+            checks[name] = typeTools.compileTypeCheck(args_def[name][constants.field.TYPE])
+            if not args_def[name].get(constants.field.OPTIONAL, False):
+                required.append(name)
+
+        def validator(data):
+
+            # Check type and non-exists
+            for field, value in data.items():
+                check = checks.get(field)
+                if check == None or not check(value):
+                    return False
+
+            # Check optional
+            for field in required:
+                if field not in data:
+                    return False
+
+            return True
+
+        return validator
+
+
+    def validate(self, data:dict) -> bool:
+        return isinstance(data, dict) and self.__validator(data)
+
+
+    def intern(data):
+
+        # Empty definitions are editable
+        if len(data) == 0:
+            return commandArgsDef(data)
+
+        key = json.dumps(data, sort_keys=True)
+        with commandArgsDef.__interned_mutex:
+            args_def = commandArgsDef.__interned.get(key)
+            if args_def == None:
+                args_def = commandArgsDef(data)
+                commandArgsDef.__interned[key] = args_def
+
+        return args_def
+
+
+    def add(self, arg_name:str, arg_type:str, optional:bool=False):
+        if self.__editable:
+            self[arg_name] = {}
+            self[arg_name][constants.field.TYPE] = arg_type
+
+            if optional:
+                self[arg_name][constants.field.OPTIONAL] = optional
+
+            self.__validator = commandArgsDef.compile(self)
+            return True
+
+        else:
+            return False
+
+    @property
+    def names(self):
+        return self.keys()
+
+
+    def getArgType(self, name):
+        return self[name][constants.field.TYPE] if name in self else None
 
-        except:
-            if isinstance(str_response, str):
-                self.__error = str_response
-            else:
-                self.__error = constants.commandErrorMsg.EXCEPTION_ERROR
-            self.__success = False
+
+    def isArgOptional(self, name):
+        return self[name][constants.field.OPTIONAL] if name in self and constants.field.OPTIONAL in self[name] else False
+
+
+class commandResponse(dict):
+
+    def __init__(self, str_response):
+        super().__init__()
+
+        try:
+            response_dict = str_response if isinstance(str_response, dict) else json.loads(str_response)
+            for item in response_dict:
+                self[item] = response_dict[item]
+            self.__success = True
+            self.__error = None
+
+
+        except:
+            if isinstance(str_response, str):
+                self.__error = str_response
+            else:
+                self.__error = constants.commandErrorMsg.EXCEPTION_ERROR
+            self.__success = False
 
     @property
     def error(self):
@@ -763,181 +1658,1867 @@ class commandResponse(dict):
         return self.__success
 
 
-class commandInterface():
+class commandChannel():
 
-    def __init__(self, mac:str, service:str, category:str, name:str, protocol:str, ip:str, 
-        port:int, params:commandArgsDef, response:commandArgsDef, enable:bool, timeout:int):
-        self.__name = name
-        self.__mac = mac
+    def __init__(self, protocol, ip, port):
+        self.__protocol = protocol
         self.__ip = ip
-        self.__service = service
-        self.__category = category
-        self.configure(enable, params, response, protocol, ip, port, timeout)
+        self.__port = port
+        self.__send_mutex = threading.Lock()
+        self.__condition = threading.Condition()
+        self.__reading = False
+        self.__pending = {}
+        self.__next_id = 0
+        self.__json_buffer = jsonBuffer()
+        self.__socket = None
+        self.__last_use = time.time()
+
+
+    def __del__(self):
+        self.close()
+
+
+    def __getSocket(self):
+
+        # Sockets are created on first use
+        with self.__condition:
+            self.__last_use = time.time()
+            if self.__socket == None:
+                if self.__protocol == constants.commandProtocol.JSON_UDP:
+                    self.__socket = udpClient(self.__ip, self.__port)
+
+                else:
+                    self.__socket = tcpClient(self.__ip, self.__port)
+                    self.__json_buffer = jsonBuffer()
+
+            return self.__socket
+
+
+    @property
+    def connected(self):
+        transport = self.__socket
+        if transport == None:
+            return False
+
+        return self.__protocol == constants.commandProtocol.JSON_UDP or transport.connected
+
+
+    def connect(self) -> bool:
+        if self.__protocol == constants.commandProtocol.JSON_UDP:
+            return True
+
+        with self.__send_mutex:
+            return self.__getSocket().connect()
+
+
+    def evict(self, idle_time) -> bool:
+
+        with self.__condition:
+            if self.__socket == None or len(self.__pending) > 0 or self.__reading or time.time() - self.__last_use < idle_time:
+                return False
+
+            self.__socket.close()
+            self.__socket = None
+            return True
+
+
+    def __send(self, msg, mtu=None):
+
+        with self.__send_mutex:
+            transport = self.__getSocket()
+            if self.__protocol == constants.commandProtocol.JSON_TCP_FRAMED:
+                return transport.sendFrame(msg)
+
+            elif self.__protocol == constants.commandProtocol.JSON_UDP:
+                return transport.sendMessage(msg, mtu)
+
+            else:
+                return transport.send(msg)
+
+
+    def __read(self):
+
+        transport = self.__getSocket()
+        if self.__protocol == constants.commandProtocol.JSON_UDP:
+            return transport.readMessage(0)
+
+        # A lost connection can not bring the pending responses back
+        if not transport.connected:
+            self.__failPending(constants.commandErrorMsg.CONNECTION_ERROR)
+            return None
+
+        if self.__protocol == constants.commandProtocol.JSON_TCP_FRAMED:
+            return transport.readFrame(0)
+
+        msg = self.__json_buffer.pop()
+        if msg == None:
+            data = transport.read(0, constants.TCP_READ_SIZE)
+            if data == None:
+                return None
+
+            self.__json_buffer.push(data)
+            msg = self.__json_buffer.pop()
+
+        return msg
+
+
+    def __failPending(self, error):
+        with self.__condition:
+            for request in self.__pending.values():
+                request.response = error
+                request.done = True
+            self.__condition.notify_all()
+
+
+    def __dispatch(self, msg):
+
+        try:
+            envelope = json.loads(msg)
+            request_id = envelope[constants.envelopeField.ID]
+
+            if constants.envelopeField.RESPONSE in envelope:
+                response = envelope[constants.envelopeField.RESPONSE]
+
+            else:
+                response = envelope[constants.envelopeField.ERROR]
+
+        except:
+            return
+
+
+        # Late responses are ignored
+        with self.__condition:
+            if request_id in self.__pending:
+                self.__pending[request_id].response = response
+                self.__pending[request_id].size = len(msg)
+                self.__pending[request_id].done = True
+                self.__condition.notify_all()
+
+
+    def request(self, args_list:list, timeout, stats=None, mtu=None) -> list:
+
+        requests = []
+        with self.__condition:
+            for args in args_list:
+                request = container()
+                request.id = self.__next_id
+                request.args = args
+                request.response = constants.commandErrorMsg.TIMEOUT_ERROR
+                request.size = 0
+                request.done = False
+                requests.append(request)
+
+                self.__pending[request.id] = request
+                self.__next_id += 1
+
+        try:
+
+            # Send all requests before waiting responses
+            for request in requests:
+                envelope = {}
+                envelope[constants.envelopeField.ID] = request.id
+                envelope[constants.envelopeField.ARGS] = request.args
+                msg = json.dumps(envelope)
+                if stats != None:
+                    stats.sent += len(msg)
+
+                if not self.__send(msg, mtu):
+                    request.response = constants.commandErrorMsg.CONNECTION_ERROR
+                    request.done = True
+
+
+            # One caller reads the socket and dispatches responses to all waiting callers
+            end_time = time.time() + timeout
+            for request in requests:
+                while True:
+                    with self.__condition:
+                        while not request.done and self.__reading and time.time() < end_time:
+                            self.__condition.wait(end_time - time.time())
+
+                        if request.done or time.time() >= end_time:
+                            break
+
+                        self.__reading = True
+
+                    try:
+                        msg = self.__read()
+                        if msg != None:
+                            self.__dispatch(msg)
+
+                    finally:
+                        with self.__condition:
+                            self.__reading = False
+                            self.__condition.notify_all()
+
+        except:
+            for request in requests:
+                if not request.done:
+                    request.response = constants.commandErrorMsg.INVALID_RESPONSE
+
+        finally:
+            with self.__condition:
+                for request in requests:
+                    self.__pending.pop(request.id, None)
+
+
+        if stats != None:
+            stats.received += sum(request.size for request in requests)
+
+        return [commandResponse(request.response) for request in requests]
+
+
+    def close(self):
+        with self.__condition:
+            if self.__socket != None:
+                self.__socket.close()
+                self.__socket = None
+
+
+class commandTransportPool():
+
+    __instance = None
+    __instance_mutex = threading.Lock()
+
+
+    def get():
+        with commandTransportPool.__instance_mutex:
+            if commandTransportPool.__instance == None:
+                commandTransportPool.__instance = commandTransportPool()
+
+            return commandTransportPool.__instance
+
+
+    def __init__(self):
+        self.__shared = container()
+        self.__shared.mutex = threading.Lock()
+        self.__shared.channels = weakref.WeakValueDictionary()
+        self.__shared.idle_time = constants.TRANSPORT_IDLE_TIME
+        self.__shared.evictions = 0
+        self.__thread = threading.Thread(target=commandTransportPool.__evictThread, daemon=True, args=[self.__shared])
+        self.__thread.start()
+
+
+    @property
+    def idleTime(self):
+        return self.__shared.idle_time
+
+
+    @idleTime.setter
+    def idleTime(self, idle_time:float):
+        self.__shared.idle_time = idle_time
+
+
+    @property
+    def channels(self):
+        with self.__shared.mutex:
+            return len(self.__shared.channels)
+
+
+    @property
+    def connections(self):
+        with self.__shared.mutex:
+            channels = list(self.__shared.channels.values())
+
+        return len([channel for channel in channels if channel.connected])
+
+
+    @property
+    def evictions(self):
+        return self.__shared.evictions
+
+
+    def channel(self, protocol, ip, port, preconnect=False) -> commandChannel:
+
+        # Channels are shared by every command interface with the same endpoint
+        key = (protocol, ip, port)
+        with self.__shared.mutex:
+            channel = self.__shared.channels.get(key)
+            if channel == None:
+                channel = commandChannel(protocol, ip, port)
+                self.__shared.channels[key] = channel
+
+        if preconnect and protocol != constants.commandProtocol.JSON_UDP and not channel.connected:
+            threading.Thread(target=channel.connect, daemon=True).start()
+
+        return channel
+
+
+    def __evictThread(shared):
+
+        while True:
+            time.sleep(constants.TRANSPORT_IDLE_CHECK)
+            with shared.mutex:
+                channels = list(shared.channels.values())
+
+            for channel in channels:
+                if channel.evict(shared.idle_time):
+                    shared.evictions += 1
+
+
+class asyncUdpProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, callback):
+        super().__init__()
+        self.__callback = callback
+        self.__fragment_buffer = fragmentBuffer()
+
+
+    def datagram_received(self, data, addr):
+        msg = self.__fragment_buffer.push(data, addr)
+        if msg != None:
+            self.__callback(msg)
+
+
+class asyncCommandChannel():
+
+    def __init__(self, protocol, ip, port):
+        self.__protocol = protocol
+        self.__ip = ip
+        self.__port = port
+        self.__loop = asyncio.get_running_loop()
+        self.__connect_mutex = asyncio.Lock()
+        self.__pending = {}
+        self.__next_id = 0
+        self.__transport = None
+        self.__writer = None
+        self.__read_task = None
+
+
+    @property
+    def loop(self):
+        return self.__loop
+
+
+    async def __connect(self):
+
+        async with self.__connect_mutex:
+            if self.__transport != None or self.__writer != None:
+                return True
+
+            try:
+                if self.__protocol == constants.commandProtocol.JSON_UDP:
+                    self.__transport, _ = await self.__loop.create_datagram_endpoint(
+                        lambda : asyncUdpProtocol(self.__dispatch), remote_addr=(self.__ip, self.__port))
+
+                else:
+                    reader, self.__writer = await asyncio.open_connection(self.__ip, self.__port)
+                    self.__read_task = self.__loop.create_task(self.__readTask(reader))
+
+                return True
+
+            except asyncio.CancelledError:
+                raise
+
+            except:
+                return False
+
+
+    async def __readTask(self, reader):
+
+        json_buffer = jsonBuffer()
+        try:
+            while True:
+                if self.__protocol == constants.commandProtocol.JSON_TCP_FRAMED:
+                    header = await reader.readexactly(constants.FRAME_HEADER.size)
+                    frame_size = constants.FRAME_HEADER.unpack(header)[0]
+                    if frame_size > constants.MAX_FRAME_SIZE:
+                        break
+
+                    self.__dispatch(await reader.readexactly(frame_size))
+
+                else:
+                    data = await reader.read(constants.TCP_READ_SIZE)
+                    if len(data) == 0:
+                        break
+
+                    json_buffer.push(data)
+                    msg = json_buffer.pop()
+                    while msg != None:
+                        self.__dispatch(msg)
+                        msg = json_buffer.pop()
+
+        except asyncio.CancelledError:
+            self.__connectionLost()
+            raise
+
+        except:
+            pass
+
+        self.__connectionLost()
+
+
+    def __connectionLost(self):
+
+        # A lost connection can not bring the pending responses back
+        if self.__writer != None:
+            self.__writer.close()
+            self.__writer = None
+
+        for future in self.__pending.values():
+            if not future.done():
+                future.set_result((constants.commandErrorMsg.CONNECTION_ERROR, 0))
+
+
+    def __dispatch(self, msg):
+
+        try:
+            envelope = json.loads(msg)
+            request_id = envelope[constants.envelopeField.ID]
+
+            if constants.envelopeField.RESPONSE in envelope:
+                response = envelope[constants.envelopeField.RESPONSE]
+
+            else:
+                response = envelope[constants.envelopeField.ERROR]
+
+        except:
+            return
+
+        # Late responses are ignored
+        future = self.__pending.get(request_id)
+        if future != None and not future.done():
+            future.set_result((response, len(msg)))
+
+
+    async def request(self, args, timeout, stats=None, mtu=None) -> commandResponse:
+
+        if not await self.__connect():
+            return commandResponse(constants.commandErrorMsg.CONNECTION_ERROR)
+
+        request_id = self.__next_id
+        self.__next_id += 1
+
+        envelope = {}
+        envelope[constants.envelopeField.ID] = request_id
+        envelope[constants.envelopeField.ARGS] = args
+
+        future = self.__loop.create_future()
+        self.__pending[request_id] = future
+
+        try:
+            msg = json.dumps(envelope).encode()
+            if stats != None:
+                stats.sent += len(msg)
+
+            if self.__protocol == constants.commandProtocol.JSON_UDP:
+                fragments = fragmentBuffer.fragment(msg, mtu)
+                if len(fragments) == 0:
+                    raise ValueError("Message too big")
+
+                for fragment in fragments:
+                    self.__transport.sendto(fragment)
+
+            else:
+                self.__writer.write(frameBuffer.frame(msg) if self.__protocol == constants.commandProtocol.JSON_TCP_FRAMED else msg)
+                await self.__writer.drain()
+
+            response, size = await asyncio.wait_for(future, timeout)
+            if stats != None:
+                stats.received += size
+
+        except asyncio.TimeoutError:
+            response = constants.commandErrorMsg.TIMEOUT_ERROR
+
+        except asyncio.CancelledError:
+            raise
+
+        except:
+            response = constants.commandErrorMsg.CONNECTION_ERROR
+
+        finally:
+            del self.__pending[request_id]
+
+        return commandResponse(response)
+
+
+    def __close(self):
+
+        if self.__transport != None:
+            self.__transport.close()
+            self.__transport = None
+
+        if self.__read_task != None:
+            self.__read_task.cancel()
+            self.__read_task = None
+
+
+    def close(self):
+        try:
+            self.__loop.call_soon_threadsafe(self.__close)
+
+        except RuntimeError:
+            pass
+
+
+class commandInterface():
+
+    def __init__(self, mac:str, service:str, category:str, name:str, protocol:str, ip:str, 
+        port:int, params:commandArgsDef, response:commandArgsDef, enable:bool, timeout:int, mtu:int=None):
+        self.__name = name
+        self.__mac = mac
+        self.__ip = ip
+        self.__service = service
+        self.__category = category
+        self.__async_channel = None
+        self.__metric_labels = (mac, service, name)
+        self.configure(enable, params, response, protocol, ip, port, timeout, mtu)
+
+
+    def configure(self, enable, params=None, response=None, protocol=None, ip=None, port=None, timeout=None, mtu=None):
+
+        if params:
+            self.__params = params
+        else:
+            self.__params = commandArgsDef()
+
+        if response:
+            self.__response = response
+        else:
+            self.__response = commandArgsDef()
+
+        self.__protocol = protocol
+        self.__enable = enable
+        self.__timeout = timeout
+        self.__mtu = mtu
+
+        self.__endpoint = (ip, port)
+
+        if enable and protocol in [constants.commandProtocol.JSON_UDP, constants.commandProtocol.JSON_TCP, constants.commandProtocol.JSON_TCP_FRAMED]:
+            self.__channel = commandTransportPool.get().channel(protocol, ip, port)
+
+        else:
+            self.__channel = None
+
+        if self.__async_channel != None:
+            self.__async_channel.close()
+            self.__async_channel = None
+
+
+    @property
+    def name(self):
+        return self.__name
+
+
+    @property
+    def mac(self):
+        return self.__mac
+
+
+    @property
+    def ip(self):
+        return self.__ip
+
+
+    @property
+    def service(self):
+        return self.__service
+
+
+    @property
+    def category(self):
+        return self.__category
+
+
+    @property
+    def params(self):
+        return self.__params
+
+
+    @property
+    def response(self):
+        return self.__response
+
+
+    @property
+    def enable(self):
+        return self.__enable
+
+
+    @property
+    def protocol(self):
+        return self.__protocol
+
+
+    @property
+    def mtu(self):
+        return self.__mtu
+
+
+    @property
+    def connected(self):
+        return self.__channel != None and self.__channel.connected
+
+
+    def preconnect(self):
+        if self.__channel != None:
+            commandTransportPool.get().channel(self.__protocol, self.__endpoint[0], self.__endpoint[1], True)
+
+
+    def call(self, args:dict, timeout=None) -> dict:
+        return self.callBatch([args], timeout)[0]
+
+
+    def callBatch(self, args_list:list, timeout=None) -> list:
+
+        if not timeout:
+            timeout = self.__timeout
+
+        channel = self.__channel
+        if channel == None:
+            return [commandResponse(constants.commandErrorMsg.NOT_ENABLE_ERROR) for args in args_list]
+
+        stats = container()
+        stats.sent = 0
+        stats.received = 0
+        start = time.perf_counter()
+        responses = channel.request(args_list, timeout, stats, self.__mtu)
+        self.__record(responses, time.perf_counter() - start)
+
+        metrics = metricsRegistry.get()
+        metrics.count("command.bytes_sent", self.__metric_labels, stats.sent)
+        metrics.count("command.bytes_received", self.__metric_labels, stats.received)
+        return responses
+
+
+    def __record(self, responses, latency):
+        metrics = metricsRegistry.get()
+        metrics.count("command.calls", self.__metric_labels, len(responses))
+        metrics.count("command.timeouts", self.__metric_labels, len([response for response in responses if response.error == constants.commandErrorMsg.TIMEOUT_ERROR]))
+        metrics.observe("command.call_latency", self.__metric_labels, latency)
+
+
+    async def callAsync(self, args:dict, timeout=None) -> dict:
+
+        if not timeout:
+            timeout = self.__timeout
+
+        if self.__channel == None:
+            return commandResponse(constants.commandErrorMsg.NOT_ENABLE_ERROR)
+
+        # Socket I/O runs on the caller event loop
+        channel = self.__async_channel
+        if channel == None or channel.loop != asyncio.get_running_loop():
+            if channel != None:
+                channel.close()
+
+            channel = asyncCommandChannel(self.__protocol, self.__endpoint[0], self.__endpoint[1])
+            self.__async_channel = channel
+
+        stats = container()
+        stats.sent = 0
+        stats.received = 0
+        start = time.perf_counter()
+        response = await channel.request(args, timeout, stats, self.__mtu)
+        self.__record([response], time.perf_counter() - start)
+
+        metrics = metricsRegistry.get()
+        metrics.count("command.bytes_sent", self.__metric_labels, stats.sent)
+        metrics.count("command.bytes_received", self.__metric_labels, stats.received)
+        return response
+
+
+class infoPublisher():
+
+    def __init__(self):
+        self.__shared = container()
+        self.__shared.run = True
+        self.__shared.mutex = threading.RLock()
+        self.__shared.writers = {}
+        self.__shared.next_id = 0
+        self.__shared.udp_socket = udpRandomPortListener()
+        self.__shared.mcast_socket = mcast(constants.INFO_MULTICAST_GROUP)
+        self.__shared.condition = threading.Condition(self.__shared.mutex)
+        self.__shared.schedule = []
+        self.__shared.frame_depth = 0
+        self.__shared.frame_cycle = 0
+        self.__shared.frame_due = None
+        self.__shared.frame_payloads = {}
+        self.__shared.next_transaction = 0
+        self.__thread = threading.Thread(target=infoPublisher.__listenUpdateReq, daemon=True, args=[self.__shared])
+        self.__shared.schedule_thread = None
+        self.__thread.start()
+
+
+    def __del__(self):
+        self.__shared.run = False
+        self.__shared.udp_socket.close()
+        self.__shared.mcast_socket.close()
+        self.__thread.join()
+
+        with self.__shared.condition:
+            self.__shared.condition.notify_all()
+
+        if self.__shared.schedule_thread:
+            self.__shared.schedule_thread.join()
+
+
+    @property
+    def requestPort(self):
+        return self.__shared.udp_socket.port
+
+
+    @property
+    def updatePort(self):
+        return self.__shared.mcast_socket.port
+
+
+    def register(self, writer_shared) -> int:
+        with self.__shared.mutex:
+            writer_id = self.__shared.next_id
+            self.__shared.next_id += 1
+            self.__shared.writers[writer_id] = writer_shared
+
+            writer_shared.sequence = 0
+            writer_shared.publish_time = 0
+            writer_shared.published_value = writer_shared.value
+            writer_shared.pending = False
+            writer_shared.due = None
+            writer_shared.entry = None
+            if writer_shared.refresh > 0:
+                infoPublisher.__schedule(self.__shared, writer_id, writer_shared, time.time() + writer_shared.refresh)
+
+        return writer_id
+
+
+    def unregister(self, writer_id):
+        with self.__shared.mutex:
+            if writer_id in self.__shared.writers:
+                del self.__shared.writers[writer_id]
+
+
+    @property
+    def publishCycle(self):
+        return self.__shared.frame_cycle
+
+
+    @publishCycle.setter
+    def publishCycle(self, cycle):
+        with self.__shared.mutex:
+            self.__shared.frame_cycle = cycle
+            if cycle <= 0 and self.__shared.frame_depth == 0:
+                infoPublisher.__flush(self.__shared)
+
+
+    def begin(self):
+        with self.__shared.mutex:
+            self.__shared.frame_depth += 1
+
+
+    def end(self) -> bool:
+        with self.__shared.mutex:
+            self.__shared.frame_depth -= 1
+            if self.__shared.frame_depth == 0:
+                return infoPublisher.__flush(self.__shared)
+
+        return True
+
+
+    def publish(self, writer_id, payload) -> bool:
+        with self.__shared.mutex:
+            return infoPublisher.__send(self.__shared, writer_id, payload)
+
+
+    def __sequenced(shared, writer_id, payload):
+
+        writer_shared = shared.writers.get(writer_id)
+        if not writer_shared:
+            return None
+
+        writer_shared.sequence = (writer_shared.sequence + 1) & constants.INFO_SEQUENCE_MASK
+        return constants.INFO_SEQUENCE.pack(writer_shared.sequence) + payload
+
+
+    def __send(shared, writer_id, payload):
+
+        if shared.frame_depth == 0 and shared.frame_cycle <= 0:
+            payload = infoPublisher.__sequenced(shared, writer_id, payload)
+            if payload == None:
+                return False
+
+            datagram = constants.INFO_HEADER.pack(writer_id) + payload
+            if not shared.mcast_socket.send(datagram):
+                return False
+
+            infoPublisher.__sent(shared, writer_id, len(datagram))
+            return True
+
+        # Latest value of each writer is sent in the next frame
+        shared.frame_payloads.pop(writer_id, None)
+        shared.frame_payloads[writer_id] = payload
+        if shared.frame_cycle > 0 and shared.frame_due == None:
+            shared.frame_due = time.time() + shared.frame_cycle
+            infoPublisher.__push(shared, [shared.frame_due, -1])
+
+        return True
+
+
+    def __flush(shared):
+
+        shared.frame_due = None
+        payloads = shared.frame_payloads
+        shared.frame_payloads = {}
+
+        entries = []
+        for writer_id in payloads:
+            payload = infoPublisher.__sequenced(shared, writer_id, payloads[writer_id])
+            if payload != None:
+                entries.append((writer_id, payload))
+
+        transaction_id = shared.next_transaction
+        shared.next_transaction = (shared.next_transaction + 1) & 0xFFFFFFFF
+
+        rc = True
+        for frame in infoPublisher.__packFrames(entries, transaction_id):
+            rc = shared.mcast_socket.send(frame) and rc
+
+        # A transaction with a lost part is discarded by the readers
+        if rc:
+            for writer_id, payload in entries:
+                infoPublisher.__sent(shared, writer_id, constants.INFO_FRAME_ENTRY.size + len(payload))
+
+        return rc
+
+
+    def __sent(shared, writer_id, size):
+
+        writer_shared = shared.writers.get(writer_id)
+        if writer_shared:
+            metrics = metricsRegistry.get()
+            metrics.count("info.writer.updates", writer_shared.metric_labels)
+            metrics.count("info.writer.bytes", writer_shared.metric_labels, size)
+
+
+    def __packFrames(entries, transaction_id=None):
+
+        parts = []
+        part = bytearray()
+        header_size = constants.INFO_HEADER.size + constants.INFO_FRAME_PART.size
+        for writer_id, payload in entries:
+            entry = constants.INFO_FRAME_ENTRY.pack(writer_id, len(payload)) + payload
+            if len(part) > 0 and header_size + len(part) + len(entry) > constants.INFO_FRAME_SIZE:
+                parts.append(bytes(part))
+                part = bytearray()
+
+            part += entry
+
+        if len(part) > 0:
+            parts.append(bytes(part))
+
+        # Parts of a transaction are applied together once all of them are received
+        header = constants.INFO_HEADER.pack(constants.INFO_FRAME_ID)
+        if transaction_id == None:
+            return [header + constants.INFO_FRAME_PART.pack(0, 0, 1) + part for part in parts]
+
+        return [header + constants.INFO_FRAME_PART.pack(transaction_id, index, len(parts)) + part for index, part in enumerate(parts)]
+
+
+    def update(self, writer_id, value, timestamp, payload) -> bool:
+
+        with self.__shared.mutex:
+            writer_shared = self.__shared.writers.get(writer_id)
+            if not writer_shared:
+                return True
+
+            writer_shared.value = value
+            writer_shared.timestamp = timestamp
+            writer_shared.payload = payload
+            if infoPublisher.__inDeadband(writer_shared):
+                return True
+
+            # Trailing edge publish of the latest value
+            current_time = time.time()
+            if current_time - writer_shared.publish_time < writer_shared.min_interval:
+                if not writer_shared.pending:
+                    writer_shared.pending = True
+                    infoPublisher.__schedule(self.__shared, writer_id, writer_shared, writer_shared.publish_time + writer_shared.min_interval)
+                return True
+
+            payload = infoPublisher.__published(self.__shared, writer_id, writer_shared, current_time)
+
+        return self.publish(writer_id, payload)
+
+
+    def __inDeadband(writer_shared):
+
+        if writer_shared.pending or (writer_shared.deadband <= 0 and writer_shared.relative_deadband <= 0):
+            return False
+
+        elif writer_shared.valueType == constants.valueTypes.FLOAT:
+            values = [writer_shared.value]
+            published_values = [writer_shared.published_value]
+
+        elif writer_shared.valueType == constants.valueTypes.FLOAT_ARRAY:
+            values = writer_shared.value
+            published_values = writer_shared.published_value
+
+        else:
+            return False
+
+        if len(values) != len(published_values):
+            return False
+
+        for value, published_value in zip(values, published_values):
+            if abs(value - published_value) > max(writer_shared.deadband, writer_shared.relative_deadband * abs(published_value)):
+                return False
+
+        return True
+
+
+    def __published(shared, writer_id, writer_shared, current_time):
+
+        writer_shared.publish_time = current_time
+        writer_shared.published_value = writer_shared.value
+        writer_shared.pending = False
+        if writer_shared.refresh > 0:
+            infoPublisher.__schedule(shared, writer_id, writer_shared, current_time + writer_shared.refresh)
+
+        else:
+            writer_shared.due = None
+
+        return writer_shared.payload
+
+
+    def __schedule(shared, writer_id, writer_shared, due):
+
+        # A queued earlier entry is pushed again to the new due time when it expires
+        writer_shared.due = due
+        if writer_shared.entry != None and writer_shared.entry[0] <= due:
+            return
+
+        writer_shared.entry = [due, writer_id]
+        infoPublisher.__push(shared, writer_shared.entry)
+
+
+    def __push(shared, entry):
+
+        heapq.heappush(shared.schedule, entry)
+        if shared.schedule[0] is entry:
+            shared.condition.notify_all()
+
+        # Drop replaced entries before they pile up
+        if len(shared.schedule) > 2 * len(shared.writers) + 16:
+            shared.schedule = [item for item in shared.schedule if infoPublisher.__isLive(shared, item)]
+            heapq.heapify(shared.schedule)
+
+        if not shared.schedule_thread:
+            shared.schedule_thread = threading.Thread(target=infoPublisher.__scheduleThread, daemon=True, args=[shared])
+            shared.schedule_thread.start()
+
+
+    def __scheduleThread(shared):
+
+        with shared.condition:
+            while shared.run:
+                if len(shared.schedule) == 0:
+                    shared.condition.wait()
+                    continue
+
+                due, writer_id = shared.schedule[0]
+                current_time = time.time()
+                if due > current_time:
+                    shared.condition.wait(due - current_time)
+                    continue
+
+                # Outdated entries are ignored
+                entry = heapq.heappop(shared.schedule)
+                if not infoPublisher.__isLive(shared, entry):
+                    continue
+
+                elif writer_id < 0:
+                    if shared.frame_depth == 0:
+                        infoPublisher.__flush(shared)
+                    continue
+
+                writer_shared = shared.writers[writer_id]
+                writer_shared.entry = None
+                if writer_shared.due == None:
+                    continue
+
+                elif writer_shared.due > current_time:
+                    infoPublisher.__schedule(shared, writer_id, writer_shared, writer_shared.due)
+                    continue
+
+                # Refreshes carry the time they are sent
+                elif not writer_shared.pending:
+                    writer_shared.timestamp = current_time
+                    writer_shared.payload = constants.INFO_TIMESTAMP.pack(current_time) + writer_shared.payload[constants.INFO_TIMESTAMP.size:]
+
+                payload = infoPublisher.__published(shared, writer_id, writer_shared, current_time)
+                infoPublisher.__send(shared, writer_id, payload)
+
+
+    def __isLive(shared, entry):
+
+        due, writer_id = entry
+        if writer_id < 0:
+            return shared.frame_due == due
+
+        writer_shared = shared.writers.get(writer_id)
+        return writer_shared != None and writer_shared.entry is entry
+
+
+    def __listenUpdateReq(shared):
+
+        while shared.run:
+            data, ip, port = shared.udp_socket.read()
+            if data == None or not data.startswith(constants.INFO_REQUEST) or (len(data) - len(constants.INFO_REQUEST)) % constants.INFO_HEADER.size != 0:
+                continue
+
+            # Requested writers, all of them when empty
+            writer_ids = [writer_id for writer_id, in constants.INFO_HEADER.iter_unpack(data[len(constants.INFO_REQUEST):])]
+            with shared.mutex:
+                if len(writer_ids) == 0:
+                    writer_ids = list(shared.writers)
+
+                entries = []
+                for writer_id in writer_ids:
+                    writer_shared = shared.writers.get(writer_id)
+                    if writer_shared:
+                        entries.append((writer_id, constants.INFO_SEQUENCE.pack(writer_shared.sequence) + writer_shared.payload))
+
+            if len(writer_ids) == 1 and len(entries) == 1:
+                shared.udp_socket.send(ip, port, constants.INFO_HEADER.pack(entries[0][0]) + entries[0][1])
+
+            else:
+
+                # Replies to a single request are bounded
+                for frame in infoPublisher.__packFrames(entries)[:constants.INFO_SNAPSHOT_MAX_FRAMES]:
+                    shared.udp_socket.send(ip, port, frame)
+
+
+class infoTransaction():
+
+    def __init__(self, publisher):
+        self.__publisher = publisher
+
+
+    def __enter__(self):
+        self.__publisher.begin()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.__publisher.end()
+        return False
+
+
+class infoWriter():
+
+    def __init__(self,mac, service, category, name, valueType, publisher=None, protocol=constants.infoProtocol.ASCII, max_rate:float=0, deadband:float=0, relative_deadband:float=0, refresh:float=0):
+
+        self.__shared = container()
+        self.__shared.id = None
+        self.__shared.name = name
+        self.__shared.mac = mac
+        self.__shared.service = service
+        self.__shared.category = category
+        self.__shared.valueType = valueType
+        self.__shared.protocol = protocol
+        self.__shared.min_interval = 1 / max_rate if max_rate > 0 else 0
+        self.__shared.deadband = deadband
+        self.__shared.relative_deadband = relative_deadband
+        self.__shared.refresh = refresh
+        self.__shared.metric_labels = (mac, service, name)
+        self.__publisher = None
+
+
+        if valueType == constants.valueTypes.BOOL or valueType == constants.valueTypes.BOOL_ARRAY:
+            self.__shared.default_value = bool()
+
+        elif valueType == constants.valueTypes.INT or valueType == constants.valueTypes.INT_ARRAY:
+            self.__shared.default_value = int()
+
+        elif valueType == constants.valueTypes.STRING or valueType == constants.valueTypes.STRING_ARRAY:
+            self.__shared.default_value = str()
+
+        elif valueType == constants.valueTypes.FLOAT or valueType == constants.valueTypes.FLOAT_ARRAY:
+            self.__shared.default_value = float()
+
+        else:
+            self.__shared.default_value = None
+
+
+        if valueType.endswith(constants.valueTypes.ARRAY):
+            self.__shared.value = []
+
+        else:
+            self.__shared.value = self.__shared.default_value
+
+
+
+        # Register in publisher
+        self.__shared.timestamp = None
+        if self.__shared.default_value != None:
+            self.__shared.timestamp = time.time()
+            self.__shared.payload = constants.INFO_TIMESTAMP.pack(self.__shared.timestamp) + typeTools.encode(self.__shared.value, self.__shared.valueType, self.__shared.protocol)
+            self.__publisher = publisher if publisher else infoPublisher()
+            self.__shared.id = self.__publisher.register(self.__shared)
+
+
+    def __del__(self):
+        if self.__publisher:
+            self.__publisher.unregister(self.__shared.id)
+
+
+    @property
+    def name(self):
+        return self.__shared.name
+
+
+    @property
+    def mac(self):
+        return self.__shared.mac
+
+
+    @property
+    def service(self):
+        return self.__shared.service
+
+
+    @property
+    def category(self):
+        return self.__shared.category
+
+
+    @property
+    def value(self):
+        return self.__shared.value
+
+
+    @property
+    def valueType(self):
+        return self.__shared.valueType
+
+
+    @property
+    def protocol(self):
+        return self.__shared.protocol
+
+
+    @property
+    def id(self):
+        return self.__shared.id
+
+
+    @property
+    def timestamp(self):
+        return self.__shared.timestamp
+
+
+    @property
+    def requestPort(self):
+        if self.__publisher:
+            return self.__publisher.requestPort
+
+        else:
+            return None
+
+    @property
+    def updatePort(self):
+        if self.__publisher:
+            return self.__publisher.updatePort
+
+        else:
+            return None
+
+
+    @property
+    def value(self):
+        return self.__shared.value
+
+
+    @value.setter
+    def value(self, value):
+        if type(self.__shared.value) == type(list()):
+            ok = True
+            for it in value:
+                if type(it) != type(self.__shared.default_value):
+                    raise Exception("Invalid asigned list type")
+
+        elif type(self.__shared.value) != type(value):
+            raise Exception("Invalid asigned type")
+
+
+        if self.__shared.value != value:
+            payload = typeTools.encode(value, self.__shared.valueType, self.__shared.protocol)
+            if payload == None:
+                raise Exception("Invalid asigned value")
+
+            timestamp = time.time()
+            payload = constants.INFO_TIMESTAMP.pack(timestamp) + payload
+            self.__publisher.update(self.__shared.id, value, timestamp, payload)
+
+
+class infoReceiver():
+
+    __instance = None
+    __instance_mutex = threading.Lock()
+    __value_mutex = threading.RLock()
+
+
+    def get():
+        with infoReceiver.__instance_mutex:
+            if infoReceiver.__instance == None:
+                infoReceiver.__instance = infoReceiver()
+
+            return infoReceiver.__instance
+
+
+    def valueMutex():
+        return infoReceiver.__value_mutex
+
+
+    def __init__(self):
+        self.__shared = container()
+        self.__shared.run = True
+        self.__shared.mutex = threading.RLock()
+        self.__shared.selector = selectors.DefaultSelector()
+        self.__shared.update_sockets = {}
+        self.__shared.update_subscriptions = {}
+        self.__shared.request_subscriptions = {}
+
+        # Request replies of all readers are received in a single socket
+        self.__shared.request_socket = udpRandomPortListener()
+        self.__shared.selector.register(self.__shared.request_socket, selectors.EVENT_READ, None)
+
+        # Value requests are coalesced per publisher by the receive thread
+        self.__shared.pending_requests = {}
+        self.__shared.wakeup_socket, self.__shared.wakeup_sender = socket.socketpair()
+        self.__shared.wakeup_socket.setblocking(False)
+        self.__shared.selector.register(self.__shared.wakeup_socket, selectors.EVENT_READ, None)
+        self.__shared.park_check = time.time()
+
+        # Requested values not received yet
+        self.__shared.outstanding_requests = {}
+        self.__shared.retry_check = time.time()
+
+        # Transactions split in several frames
+        self.__shared.partial_frames = collections.OrderedDict()
+
+        self.__thread = threading.Thread(target=infoReceiver.__receiveThread, daemon=True, args=[self.__shared])
+        self.__thread.start()
+
+
+    def subscribe(self, ip, req_port, update_port, writer_id, handler):
+
+        subscription = container()
+        subscription.handler = handler
+        subscription.park = None
+        subscription.active = True
+        subscription.socket_key = (ip, update_port)
+        subscription.update_key = (ip, update_port, writer_id)
+        subscription.request_key = (ip, req_port, writer_id)
+
+        with self.__shared.mutex:
+
+            # Join (group, source) only once per publisher
+            if subscription.socket_key not in self.__shared.update_sockets:
+                update_socket = mcast(constants.INFO_MULTICAST_GROUP, update_port, ip)
+                self.__shared.update_sockets[subscription.socket_key] = container()
+                self.__shared.update_sockets[subscription.socket_key].socket = update_socket
+                self.__shared.update_sockets[subscription.socket_key].count = 0
+                self.__shared.selector.register(update_socket, selectors.EVENT_READ, subscription.socket_key)
+
+            self.__shared.update_sockets[subscription.socket_key].count += 1
+
+            if subscription.update_key not in self.__shared.update_subscriptions:
+                self.__shared.update_subscriptions[subscription.update_key] = []
+
+            self.__shared.update_subscriptions[subscription.update_key].append(subscription)
+
+            if subscription.request_key not in self.__shared.request_subscriptions:
+                self.__shared.request_subscriptions[subscription.request_key] = []
+
+            self.__shared.request_subscriptions[subscription.request_key].append(subscription)
+
+
+            # Request current value
+            publisher_key = (ip, req_port)
+            if len(self.__shared.pending_requests) == 0:
+                self.__shared.wakeup_sender.send(b"\0")
+
+            if publisher_key not in self.__shared.pending_requests:
+                self.__shared.pending_requests[publisher_key] = []
+
+            self.__shared.pending_requests[publisher_key].append(writer_id)
+
+        return subscription
+
+
+    def request(self, subscription):
+        ip, req_port, writer_id = subscription.request_key
+        return self.__shared.request_socket.send(ip, req_port, constants.INFO_REQUEST + constants.INFO_HEADER.pack(writer_id))
+
+
+    def __requestSnapshot(shared, ip, req_port, writer_ids):
+
+        # Current values of many writers with few requests
+        rc = True
+        chunk_size = (constants.MTU - len(constants.INFO_REQUEST)) // constants.INFO_HEADER.size
+        for index in range(0, max(1, len(writer_ids)), chunk_size):
+            request = constants.INFO_REQUEST + b"".join(constants.INFO_HEADER.pack(writer_id) for writer_id in writer_ids[index:index + chunk_size])
+            rc = shared.request_socket.send(ip, req_port, request) and rc
+
+        return rc
+
+
+    def unsubscribe(self, subscription):
+
+        with self.__shared.mutex:
+            subscription.active = False
+
+            subscriptions = self.__shared.request_subscriptions.get(subscription.request_key, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+            if len(subscriptions) == 0 and subscription.request_key in self.__shared.request_subscriptions:
+                del self.__shared.request_subscriptions[subscription.request_key]
+
+            subscriptions = self.__shared.update_subscriptions.get(subscription.update_key, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+                update_socket = self.__shared.update_sockets[subscription.socket_key]
+                update_socket.count -= 1
+
+                # Leave group when there are no more readers
+                if update_socket.count == 0:
+                    del self.__shared.update_sockets[subscription.socket_key]
+                    self.__shared.selector.unregister(update_socket.socket)
+                    update_socket.socket.close()
+
+            if len(subscriptions) == 0 and subscription.update_key in self.__shared.update_subscriptions:
+                del self.__shared.update_subscriptions[subscription.update_key]
+
+
+    def __receiveThread(shared):
+
+        while shared.run:
+
+            for key, mask in shared.selector.select(constants.RX_TIMEOUT):
+
+                # Pending value requests
+                if key.fileobj == shared.wakeup_socket:
+                    infoReceiver.__sendRequests(shared)
+                    continue
+
+                # Request reply
+                elif key.data == None:
+                    data, ip, port = shared.request_socket.read(0)
+                    timestamp = time.time()
+                    reply = True
+                    subscriptions_map = shared.request_subscriptions
+
+                # Multicast update
+                else:
+                    data, ip, port, timestamp = key.fileobj.readStamped(0)
+                    ip, port = key.data
+                    reply = False
+                    subscriptions_map = shared.update_subscriptions
+
+                if data == None or len(data) < constants.INFO_HEADER.size:
+                    continue
+
+                writer_id = constants.INFO_HEADER.unpack_from(data)[0]
+                if writer_id == constants.INFO_FRAME_ID:
+                    entries = infoReceiver.__unpackFrame(shared, data, (ip, port))
+                    if entries == None:
+                        continue
+
+                else:
+                    entries = [(writer_id, data[constants.INFO_HEADER.size:])]
+
+                with shared.mutex:
+                    updates = [(subscription, payload) for writer_id, payload in entries for subscription in subscriptions_map.get((ip, port, writer_id), [])]
+                    for subscription, payload in updates:
+                        shared.outstanding_requests.pop(subscription.request_key, None)
+
+
+                # All values of a transaction are applied together before any callback
+                notifications = []
+                with infoReceiver.__value_mutex:
+                    for subscription, payload in updates:
+                        if subscription.active:
+                            try:
+                                notifications.append(subscription.handler(payload, timestamp, reply))
+
+                            except:
+                                logger.exception("Info update handler failed")
+
+                # A failing reader must not stop the shared receive thread
+                for notify in notifications:
+                    try:
+                        notify()
+
+                    except:
+                        logger.exception("Info update notification failed")
+
+            if time.time() - shared.retry_check >= constants.RX_TIMEOUT:
+                shared.retry_check = time.time()
+                infoReceiver.__retryRequests(shared)
+
+            if time.time() - shared.park_check >= constants.READER_PARK_CHECK:
+                shared.park_check = time.time()
+                infoReceiver.__parkIdle(shared)
+
+
+    def __sendRequests(shared):
+
+        try:
+            while shared.wakeup_socket.recv(4096):
+                pass
+
+        except (BlockingIOError, socket.error):
+            pass
+
+        with shared.mutex:
+            pending_requests = shared.pending_requests
+            shared.pending_requests = {}
+
+            deadline = time.time() + constants.INFO_REQUEST_TIMEOUT
+            for (ip, req_port), writer_ids in pending_requests.items():
+                for writer_id in writer_ids:
+                    shared.outstanding_requests[(ip, req_port, writer_id)] = [deadline, 0]
+
+        for (ip, req_port), writer_ids in pending_requests.items():
+            infoReceiver.__requestSnapshot(shared, ip, req_port, writer_ids)
+
+
+    def __retryRequests(shared):
+
+        # Lost replies are requested again
+        current_time = time.time()
+        retry_requests = {}
+        with shared.mutex:
+            for request_key, outstanding in list(shared.outstanding_requests.items()):
+                if outstanding[0] > current_time:
+                    continue
+
+                elif outstanding[1] >= constants.INFO_REQUEST_RETRIES or request_key not in shared.request_subscriptions:
+                    del shared.outstanding_requests[request_key]
+                    continue
+
+                outstanding[0] = current_time + constants.INFO_REQUEST_TIMEOUT
+                outstanding[1] += 1
+                ip, req_port, writer_id = request_key
+                retry_requests.setdefault((ip, req_port), []).append(writer_id)
+
+        for (ip, req_port), writer_ids in retry_requests.items():
+            infoReceiver.__requestSnapshot(shared, ip, req_port, writer_ids)
+
+
+    def __parkIdle(shared):
+
+        with shared.mutex:
+            park_list = [subscription.park for subscriptions in shared.update_subscriptions.values() for subscription in subscriptions if subscription.park]
+
+        for park in park_list:
+            try:
+                park()
+
+            except:
+                logger.exception("Info reader park failed")
+
+
+    def __unpackFrame(shared, data, source):
+
+        if len(data) < constants.INFO_HEADER.size + constants.INFO_FRAME_PART.size:
+            return None
+
+        transaction_id, index, count = constants.INFO_FRAME_PART.unpack_from(data, constants.INFO_HEADER.size)
+        entries = []
+        offset = constants.INFO_HEADER.size + constants.INFO_FRAME_PART.size
+        while offset + constants.INFO_FRAME_ENTRY.size <= len(data):
+            writer_id, size = constants.INFO_FRAME_ENTRY.unpack_from(data, offset)
+            offset += constants.INFO_FRAME_ENTRY.size
+            if offset + size > len(data):
+                break
+
+            entries.append((writer_id, data[offset:offset + size]))
+            offset += size
+
+        if count <= 1:
+            return entries
+
+        elif index >= count:
+            return None
+
+
+        # Incomplete transactions are dropped, oldest first
+        current_time = time.time()
+        partial_frames = shared.partial_frames
+        while len(partial_frames) > 0:
+            key, partial = next(iter(partial_frames.items()))
+            if current_time - partial.time <= constants.INFO_FRAME_TIMEOUT and len(partial_frames) < constants.INFO_FRAME_MAX_PENDING:
+                break
+
+            del partial_frames[key]
+
+        key = (source, transaction_id)
+        partial = partial_frames.get(key)
+        if partial == None or partial.count != count:
+            partial = container()
+            partial.time = current_time
+            partial.count = count
+            partial.parts = {}
+            partial_frames[key] = partial
+
+        partial.parts[index] = entries
+        if len(partial.parts) < count:
+            return None
+
+        del partial_frames[key]
+        return [entry for index in range(count) for entry in partial.parts[index]]
+
+
+class ringBuffer():
+
+    def __init__(self, capacity, valueType):
+        self.__capacity = max(1, capacity)
+        self.__head = 0
+        self.__count = 0
+        self.__times = array.array("d", bytes(8 * self.__capacity))
+
+        # Numeric types use typed storage
+        if valueType == constants.valueTypes.INT:
+            self.__values = array.array("q", bytes(8 * self.__capacity))
+
+        elif valueType == constants.valueTypes.FLOAT:
+            self.__values = array.array("d", bytes(8 * self.__capacity))
+
+        elif valueType == constants.valueTypes.BOOL:
+            self.__values = array.array("b", bytes(self.__capacity))
+
+        else:
+            self.__values = [None] * self.__capacity
+
+
+    @property
+    def capacity(self):
+        return self.__capacity
+
+
+    def __len__(self):
+        return self.__count
+
+
+    def append(self, timestamp, value):
+        try:
+            self.__values[self.__head] = value
+
+        except (OverflowError, TypeError, ValueError):
+
+            # Values out of the typed range switch to generic storage
+            if not isinstance(self.__values, list):
+                self.__values = self.__values.tolist()
+            self.__values[self.__head] = value
+
+        self.__times[self.__head] = timestamp
+        self.__head = (self.__head + 1) % self.__capacity
+        self.__count = min(self.__count + 1, self.__capacity)
+
+
+    def clear(self):
+        self.__head = 0
+        self.__count = 0
+
+
+    def last(self, count=None):
+
+        if count == None or count > self.__count:
+            count = self.__count
+
+        start = (self.__head - count) % self.__capacity
+        if count == 0:
+            return self.__times[:0], self.__values[:0]
+
+        elif start < self.__head:
+            return self.__times[start:self.__head], self.__values[start:self.__head]
+
+        else:
+            return self.__times[start:] + self.__times[:self.__head], self.__values[start:] + self.__values[:self.__head]
+
+
+    def window(self, start_time, end_time=None):
+
+        times, values = self.last()
+        start = bisect.bisect_left(times, start_time)
+        end = len(times) if end_time == None else bisect.bisect_right(times, end_time)
+        return times[start:end], values[start:end]
+
+
+class infoReader():
+
+    __default_executor = None
+    __default_executor_mutex = threading.Lock()
+
+
+    def __init__(self,mac, service, category, name, valueType, ip, req_port, update_port, writer_id, protocol=constants.infoProtocol.ASCII):
+        self.__shared = container()
+        self.__shared.name = name
+        self.__shared.mac = mac
+        self.__shared.ip = ip
+        self.__shared.service = service
+        self.__shared.category = category
+        self.__shared.valueType = valueType
+        self.__shared.protocol = protocol
+        self.__shared.metric_labels = (mac, service, name)
+        self.__shared.epoch = None
+        self.__shared.on_update_callback_list = []
+        self.__shared.callback_mutex = threading.RLock()
+        self.__shared.value_mutex = infoReceiver.valueMutex()
+
+        # Callback dispatch
+        self.__shared.notify_mutex = threading.Lock()
+        self.__shared.executor = None
+        self.__shared.queue_size = constants.CALLBACK_QUEUE_SIZE
+        self.__shared.conflate = False
+        self.__shared.pending = 0
+        self.__shared.max_pending = 0
+        self.__shared.scheduled = False
+        self.__shared.queued = 0
+        self.__shared.conflated = 0
+        self.__shared.dropped = 0
+
+        self.__shared.value = None
+        self.__shared.publish_timestamp = None
+        self.__shared.receive_timestamp = None
+        self.__shared.history = None
+
+        # Multicast health
+        self.__shared.sequence = None
+        self.__shared.received = 0
+        self.__shared.lost = 0
+        self.__shared.reordered = 0
+        self.__shared.resyncs = 0
+
+        # Receive path is started on first use
+        self.__shared.activation_mutex = threading.RLock()
+        self.__shared.subscription = None
+        self.__shared.endpoint = None
+        self.__shared.park_time = 0
+        self.__shared.last_access = 0
+
+        self.configure(ip, req_port, update_port, writer_id, protocol)
+
+
+    def configure(self, ip, req_port, update_port, writer_id, protocol=constants.infoProtocol.ASCII):
+
+        with self.__shared.activation_mutex:
+            self.__shared.protocol = protocol
+
+            active = self.__shared.subscription != None
+            if active:
+                infoReceiver.get().unsubscribe(self.__shared.subscription)
+                self.__shared.subscription = None
+
+            with self.__shared.value_mutex:
+                self.__shared.sequence = None
+
+            # Subscribe to updates
+            if ip != None:
+                self.__shared.endpoint = (ip, req_port, update_port, writer_id)
+                if active:
+                    infoReader.__activate(self.__shared)
+
+            else:
+                self.__shared.endpoint = None
+                if self.__shared.value != None:
+                    self.__shared.value = None
+
+                    infoReader.__notify(self.__shared)
+
+
+    def __del__(self):
+        with self.__shared.activation_mutex:
+            if self.__shared.subscription != None:
+                infoReceiver.get().unsubscribe(self.__shared.subscription)
+                self.__shared.subscription = None
+
 
+    def __activate(shared):
 
-    def configure(self, enable, params=None, response=None, protocol=None, ip=None, port=None, timeout=None):
+        shared.last_access = time.time()
+        if shared.subscription != None:
+            return
 
-        if params:
-            self.__params = params
-        else:
-            self.__params = commandArgsDef()
+        with shared.activation_mutex:
+            if shared.subscription == None and shared.endpoint != None:
+                ip, req_port, update_port, writer_id = shared.endpoint
+                shared.subscription = infoReceiver.get().subscribe(ip, req_port, update_port, writer_id,
+                    lambda data, timestamp, reply, shared=shared : infoReader.__updateValue(shared, data, timestamp, reply))
+                shared.subscription.park = lambda shared=shared : infoReader.__park(shared)
 
-        if response:
-            self.__response = response
-        else:
-            self.__response = commandArgsDef()
 
-        self.__protocol = protocol
-        self.__enable = enable
-        self.__timeout = timeout
+    def __park(shared):
 
-        if enable:
-            if protocol == constants.commandProtocol.JSON_UDP:
-                self.__socket = udpClient(ip, port)
+        with shared.activation_mutex:
+            if shared.subscription == None or shared.park_time <= 0 or time.time() - shared.last_access < shared.park_time:
+                return
 
-            elif protocol == constants.commandProtocol.JSON_TCP:
-                self.__socket = tcpClient(ip, port)
+            with shared.callback_mutex:
+                if any(weak_callback() for weak_callback in shared.on_update_callback_list):
+                    return
 
-            else:
-                self.__socket = None
-        else:
-            self.__socket = None
+            # Parked readers keep the last value until they are used again
+            infoReceiver.get().unsubscribe(shared.subscription)
+            shared.subscription = None
+            with shared.value_mutex:
+                shared.sequence = None
 
 
-    @property
-    def name(self):
-        return self.__name
+    def __getDefaultExecutor():
+        # A slow callback only holds one worker, other readers keep being notified
+        with infoReader.__default_executor_mutex:
+            if infoReader.__default_executor == None:
+                infoReader.__default_executor = commandDispatcher(constants.CALLBACK_WORKERS, 0)
 
+            return infoReader.__default_executor
 
-    @property
-    def mac(self):
-        return self.__mac
 
+    def __notify(shared):
 
-    @property
-    def ip(self):
-        return self.__ip
+        with shared.notify_mutex:
+            if shared.pending > 0 and shared.conflate:
+                shared.conflated += 1
+                return
 
+            elif shared.pending >= shared.queue_size:
+                shared.dropped += 1
+                return
 
-    @property
-    def service(self):
-        return self.__service
+            shared.pending += 1
+            shared.max_pending = max(shared.max_pending, shared.pending)
+            shared.queued += 1
 
+            if shared.scheduled:
+                return
 
-    @property
-    def category(self):
-        return self.__category
+            shared.scheduled = True
+            executor = shared.executor if shared.executor else infoReader.__getDefaultExecutor()
 
+        # A single drain task per reader keeps notifications ordered
+        try:
+            submitted = executor.submit(lambda : infoReader.__drain(shared))
 
-    @property
-    def params(self):
-        return self.__params
+        except:
+            submitted = False
 
+        if submitted == False:
+            with shared.notify_mutex:
+                shared.dropped += shared.pending
+                shared.pending = 0
+                shared.scheduled = False
 
-    @property
-    def response(self):
-        return self.__response
 
+    def __drain(shared):
 
-    @property
-    def enable(self):
-        return self.__enable
+        while True:
+            with shared.notify_mutex:
+                if shared.pending == 0:
+                    shared.scheduled = False
+                    return
 
+                shared.pending -= 1
 
-    @property
-    def protocol(self):
-        return self.__protocol
+            try:
+                infoReader.__callbackExec(shared)
 
+            except:
+                pass
 
-    def call(self, args:dict, timeout=None) -> dict:
 
-        if not timeout:
-            timeout = self.__timeout
+    def __callbackExec(shared):
+        start = time.perf_counter()
+        with shared.callback_mutex:
 
-        if self.__socket == None:
-            return commandResponse(constants.commandErrorMsg.NOT_ENABLE_ERROR)
+            remove_list = []
+            for weak_callback in shared.on_update_callback_list:
+                shared_calback = weak_callback()
 
-        try:
-            response = constants.commandErrorMsg.CONNECTION_ERROR
-            self.__socket.send(json.dumps(args, indent=1))
-            socket_response = self.__socket.read(timeout)
-            if socket_response:
-                response = socket_response.decode()
-                while response.startswith("{") and not response.endswith("}"):
-                    read_response = self.__socket.read(timeout)
-                    if read_response:
-                        response += read_response.decode()
-                    else:
-                        if response.startswith("{"):
-                            response = constants.commandErrorMsg.INCOMPLETE_RESPONSE
-                        break
-            else:
-                response = constants.commandErrorMsg.TIMEOUT_ERROR
+                if shared_calback:
+                    shared_calback()
 
-        except:
-            response = constants.commandErrorMsg.INVALID_RESPONSE
+                else:
+                    remove_list.append(weak_callback)
 
+            for weak_callback in remove_list:
+                shared.on_update_callback_list.remove(weak_callback)
 
-        return commandResponse(response) 
+        metricsRegistry.get().observe("info.reader.callback_time", shared.metric_labels, time.perf_counter() - start)
 
 
-class infoWriter():
+    def __checkSequence(shared, sequence, reply):
 
-    def __init__(self,mac, service, category, name, valueType):
+        if shared.sequence == None:
+            shared.sequence = sequence
+            return True, False
 
-        self.__shared = container()
-        self.__shared.run = True
-        self.__shared.udp_socket = None
-        self.__shared.mcast_socket = None
-        self.__shared.name = name
-        self.__shared.mac = mac
-        self.__shared.service = service
-        self.__shared.category = category
-        self.__shared.valueType = valueType
-        self.__thread = None
+        # Sequence numbers wrap around
+        diff = (sequence - shared.sequence) & constants.INFO_SEQUENCE_MASK
+        if reply:
+            if diff > constants.INFO_SEQUENCE_MASK // 2:
+                return False, False
 
+            shared.sequence = sequence
+            return True, False
 
-        if valueType == constants.valueTypes.BOOL or valueType == constants.valueTypes.BOOL_ARRAY:
-            self.__shared.default_value = bool()
+        elif diff == 0 or diff > constants.INFO_SEQUENCE_MASK // 2:
+            shared.reordered += 1
+            return False, False
 
-        elif valueType == constants.valueTypes.INT or valueType == constants.valueTypes.INT_ARRAY:
-            self.__shared.default_value = int()
+        shared.received += 1
+        shared.sequence = sequence
+        if diff > 1:
+            shared.lost += diff - 1
+            shared.resyncs += 1
+            return True, True
 
-        elif valueType == constants.valueTypes.STRING or valueType == constants.valueTypes.STRING_ARRAY:
-            self.__shared.default_value = str()
+        return True, False
 
-        elif valueType == constants.valueTypes.FLOAT or valueType == constants.valueTypes.FLOAT_ARRAY:
-            self.__shared.default_value = float()
 
-        else:
-            self.__shared.default_value = None
+    def __updateValue(shared, data, timestamp, reply):
 
+        header_size = constants.INFO_SEQUENCE.size + constants.INFO_TIMESTAMP.size
+        if len(data) < header_size:
+            return lambda : None
 
-        if valueType.endswith(constants.valueTypes.ARRAY):
-            self.__shared.value = []
+        with shared.value_mutex:
+            accepted, resync = infoReader.__checkSequence(shared, constants.INFO_SEQUENCE.unpack_from(data)[0], reply)
+            if accepted:
+                start = time.perf_counter()
+                shared.value = typeTools.decode(data[header_size:], shared.valueType, shared.protocol)
 
-        else:
-            self.__shared.value = self.__shared.default_value
+                metrics = metricsRegistry.get()
+                metrics.observe("info.reader.decode_time", shared.metric_labels, time.perf_counter() - start)
+                metrics.count("info.reader.updates", shared.metric_labels)
+                metrics.count("info.reader.bytes", shared.metric_labels, len(data))
+                shared.publish_timestamp = constants.INFO_TIMESTAMP.unpack_from(data, constants.INFO_SEQUENCE.size)[0]
+                shared.receive_timestamp = timestamp
+                shared.epoch = int(time.time())
 
+                if shared.history != None and shared.value != None:
+                    shared.history.append(timestamp, shared.value)
 
-        if self.__shared.default_value != None:
-            self.__shared.udp_socket = udpRandomPortListener()
-            self.__shared.mcast_socket = mcast(constants.INFO_MULTICAST_GROUP)
-            self.__thread = threading.Thread(target=infoWriter.__listetenUpdateReq, daemon=True, args=[self.__shared])
-            self.__thread.start()
+        # Lost updates are recovered with a current value request
+        subscription = shared.subscription
+        if resync and subscription != None:
+            infoReceiver.get().request(subscription)
 
+        if not accepted:
+            return lambda : None
+
+        return lambda : infoReader.__notify(shared)
 
-    def __del__(self):
-        self.__shared.run = False
 
-        if self.__shared.udp_socket:
-            self.__shared.udp_socket.close()
+    def values(readers:list) -> list:
 
-        if self.__shared.mcast_socket:
-            self.__shared.mcast_socket.close()
+        # Values of one transaction are never read mixed with older ones
+        for reader in readers:
+            infoReader.__activate(reader.__shared)
 
-        if self.__thread:
-            self.__thread.join()
+        with infoReceiver.valueMutex():
+            return [reader.__shared.value for reader in readers]
 
 
     @property
@@ -950,6 +3531,11 @@ class infoWriter():
         return self.__shared.mac
 
 
+    @property
+    def ip(self):
+        return self.__shared.ip
+
+
     @property
     def service(self):
         return self.__shared.service
@@ -962,7 +3548,9 @@ class infoWriter():
 
     @property
     def value(self):
-        return self.__shared.value
+        infoReader.__activate(self.__shared)
+        with self.__shared.value_mutex:
+            return self.__shared.value
 
 
     @property
@@ -971,218 +3559,405 @@ class infoWriter():
 
 
     @property
-    def requestPort(self):
-        if self.__shared.udp_socket:
-            return self.__shared.udp_socket.port
+    def protocol(self):
+        return self.__shared.protocol
 
-        else:
-            return None
 
     @property
-    def updatePort(self):
-        if self.__shared.mcast_socket:
-            return self.__shared.mcast_socket.port
+    def epoch(self):
+        infoReader.__activate(self.__shared)
+        with self.__shared.value_mutex:
+            return self.__shared.epoch
 
-        else:
-            return None
+
+    @property
+    def publishTimestamp(self):
+        infoReader.__activate(self.__shared)
+        with self.__shared.value_mutex:
+            return self.__shared.publish_timestamp
 
 
     @property
-    def value(self):
-        return self.__shared.value
+    def receiveTimestamp(self):
+        infoReader.__activate(self.__shared)
+        with self.__shared.value_mutex:
+            return self.__shared.receive_timestamp
 
 
-    @value.setter
-    def value(self, value):
-        if type(self.__shared.value) == type(list()):
-            ok = True
-            for it in value:
-                if type(it) != type(self.__shared.default_value):
-                    raise Exception("Invalid asigned list type")
+    @property
+    def online(self):
+        return self.value != None
 
-        elif type(self.__shared.value) != type(value):
-            raise Exception("Invalid asigned type")
 
+    @property
+    def active(self):
+        return self.__shared.subscription != None
 
-        if self.__shared.value != value:
-            self.__shared.value = value
-            self.__shared.mcast_socket.send(typeTools.convertToASCII(self.__shared.value, self.__shared.valueType))
 
+    @property
+    def parkTime(self):
+        return self.__shared.park_time
 
-    def __listetenUpdateReq(shared):
 
-        while shared.run:
-            data, ip, port = shared.udp_socket.read()
-            if data == constants.INFO_REQUEST:
-                shared.udp_socket.send(ip, port, typeTools.convertToASCII(shared.value, shared.valueType))
+    @parkTime.setter
+    def parkTime(self, park_time:float):
+        self.__shared.park_time = park_time
 
-        shared.udp_socket.close()
 
+    def enableHistory(self, capacity:int):
+        infoReader.__activate(self.__shared)
+        with self.__shared.value_mutex:
+            self.__shared.history = ringBuffer(capacity, self.__shared.valueType)
 
-class infoReader():
 
-    def __init__(self,mac, service, category, name, valueType, ip, req_port, update_port):
-        self.__shared = container()
-        self.__shared.name = name
-        self.__shared.mac = mac
-        self.__shared.ip = ip
-        self.__shared.service = service
-        self.__shared.category = category
-        self.__shared.valueType = valueType
-        self.__shared.epoch = None
-        self.__shared.on_update_callback_list = []
-        self.__shared.callback_mutex = threading.RLock()
-        self.__shared.value_mutex = threading.RLock()
+    def disableHistory(self):
+        with self.__shared.value_mutex:
+            self.__shared.history = None
 
-        self.__shared.value = None
-        self.__thread = None
-        self.__shared.udp_socket = None
-        self.__shared.mcast_socket = None
-        self.__shared.run = False
-        self.configure(ip, req_port, update_port)
 
+    def history(self, count:int=None, start_time:float=None, end_time:float=None) -> tuple:
+        with self.__shared.value_mutex:
+            if self.__shared.history == None:
+                return None, None
+
+            elif start_time != None:
+                return self.__shared.history.window(start_time, end_time)
+
+            else:
+                return self.__shared.history.last(count)
 
-    def configure(self, ip, req_port, update_port):
 
-        self.__shared.run = False
+    def configureCallbacks(self, executor=None, queue_size:int=constants.CALLBACK_QUEUE_SIZE, conflate:bool=False):
+        with self.__shared.notify_mutex:
+            self.__shared.executor = executor
+            self.__shared.queue_size = max(1, queue_size)
+            self.__shared.conflate = conflate
 
-        if self.__shared.udp_socket != None:
-            self.__shared.udp_socket.close()
 
-        if self.__shared.mcast_socket != None:
-            self.__shared.mcast_socket.close()
+    def getSequenceStats(self):
+        with self.__shared.value_mutex:
+            stats = container()
+            stats.sequence = self.__shared.sequence
+            stats.received = self.__shared.received
+            stats.lost = self.__shared.lost
+            stats.reordered = self.__shared.reordered
+            stats.resyncs = self.__shared.resyncs
+            return stats
+
+
+    def getCallbackStats(self):
+        with self.__shared.notify_mutex:
+            stats = container()
+            stats.depth = self.__shared.pending
+            stats.max_depth = self.__shared.max_pending
+            stats.capacity = self.__shared.queue_size
+            stats.queued = self.__shared.queued
+            stats.conflated = self.__shared.conflated
+            stats.dropped = self.__shared.dropped
+            return stats
+
+
+    def addOnUpdateCallback(self, callback):
+        weak_ptr = weakref.ref(callback)
+        with self.__shared.callback_mutex:
+            if weak_ptr not in self.__shared.on_update_callback_list:
+                self.__shared.on_update_callback_list.append(weak_ptr)
+
+        infoReader.__activate(self.__shared)
+
+
+class ownIPResolver():
+
+    __instance = None
+    __instance_mutex = threading.Lock()
+
+
+    def get():
+        with ownIPResolver.__instance_mutex:
+            if ownIPResolver.__instance == None:
+                ownIPResolver.__instance = ownIPResolver()
+
+            return ownIPResolver.__instance
+
 
-        if self.__thread != None:
-            self.__thread.join()
+    def __init__(self):
+        self.__shared = container()
+        self.__shared.mutex = threading.Lock()
+        self.__shared.cache = {}
+        self.__shared.generation = 0
 
-        # Lauch thread
-        if ip != None:
-            self.__shared.run = True
-            self.__shared.udp_socket = udpClient(ip, req_port)
-            self.__shared.mcast_socket = mcast(constants.INFO_MULTICAST_GROUP, update_port, ip)
-            self.__thread = threading.Thread(target=infoReader.__read_updates_thread, daemon=True, args=[self.__shared])
+        # Route and address changes drop the cached addresses
+        self.__shared.monitor = False
+        if os.name != 'nt':
+            started = threading.Event()
+            self.__thread = threading.Thread(target=ownIPResolver.__monitorThread, daemon=True, args=[self.__shared, started])
             self.__thread.start()
+            started.wait()
 
-        else:
-            self.__shared.udp_socket = None
-            self.__shared.mcast_socket = None
-            self.__thread = None
 
+    def __monitorThread(shared, started):
 
-            if self.__shared.value != None:
-                self.__shared.value = None
+        # Netlink socket is owned by this thread
+        try:
+            route_obj = IPRoute()
+            route_obj.bind(groups=RTMGRP_IPV4_ROUTE | RTMGRP_IPV4_IFADDR)
+            selector = selectors.DefaultSelector()
+            selector.register(route_obj.fileno(), selectors.EVENT_READ)
+            shared.monitor = True
 
-                infoReader.__callbackExec(self.__shared)
+        except:
+            return
 
+        finally:
+            started.set()
 
-    def __del__(self):
-        self.__shared.run = False
+        while True:
+            try:
+                if len(selector.select()) > 0:
+                    route_obj.get()
+                    ownIPResolver.__invalidate(shared)
 
-        if self.__shared.udp_socket != None:
-            self.__shared.udp_socket.close()
+            except:
+                break
 
-        if self.__shared.mcast_socket != None:
-            self.__shared.mcast_socket.close()
+        # Without notifications the cache can not be trusted
+        with shared.mutex:
+            shared.monitor = False
+            shared.cache = {}
+            shared.generation += 1
 
-        if self.__thread != None:
-            self.__thread.join()
 
+    def __invalidate(shared):
+        with shared.mutex:
+            shared.cache = {}
+            shared.generation += 1
 
-    def __callbackExec(shared):
-        with shared.callback_mutex:
 
-            remove_list = []
-            for weak_callback in shared.on_update_callback_list:
-                shared_calback = weak_callback()
+    def invalidate(self):
+        ownIPResolver.__invalidate(self.__shared)
 
-                if shared_calback:
-                    shared_calback()
 
-                else:
-                    remove_list.append(weak_callback)
+    def resolve(self, dst='127.0.0.1'):
 
-            for weak_callback in remove_list:
-                shared.on_update_callback_list.remove(weak_callback)
+        if not dst:
+            return ""
 
+        elif os.name == 'nt':
+            return ""
 
-    def __read_updates_thread(shared):
+        with self.__shared.mutex:
+            if dst in self.__shared.cache:
+                return self.__shared.cache[dst]
 
-        shared.udp_socket.send(constants.INFO_REQUEST)
-        data = shared.udp_socket.read(timeout=5)
-        if data != None:
-            with shared.value_mutex:
-                shared.value = typeTools.convevertFromASCII(data.decode(), shared.valueType)
-                shared.epoch = int(time.time())
+            generation = self.__shared.generation
+            cacheable = self.__shared.monitor
 
-            infoReader.__callbackExec(shared)
+        route_obj = IPRoute()
+        ipr = route_obj.route('get', dst=dst)
+        ip = ipr[0].get_attr('RTA_PREFSRC') if len(ipr) > 0 else "127.0.0.1"
+        route_obj.close()
 
+        # Result is discarded if the routes changed meanwhile
+        with self.__shared.mutex:
+            if cacheable and generation == self.__shared.generation:
+                self.__shared.cache[dst] = ip
 
-        while shared.run:
-            data, ip, port = shared.mcast_socket.read()
-            if data != None:
-                with shared.value_mutex:
-                    shared.value = typeTools.convevertFromASCII(data.decode(), shared.valueType)
-                    shared.epoch = int(time.time())
+        return ip
 
-                infoReader.__callbackExec(shared)
 
-        shared.mcast_socket.close()
-        shared.udp_socket.close()
+class descriptorCache():
+
+    def __init__(self, size=constants.DESCRIPTOR_CACHE_SIZE):
+        self.__size = size
+        self.__mutex = threading.Lock()
+        self.__entries = collections.OrderedDict()
+
+
+    def get(self, path, raw, parser):
+
+        key = (path, raw)
+        with self.__mutex:
+            if key in self.__entries:
+                self.__entries.move_to_end(key)
+                return self.__entries[key]
+
+        descriptor = parser(raw)
+        with self.__mutex:
+            self.__entries[key] = descriptor
+            while len(self.__entries) > self.__size:
+                self.__entries.popitem(last=False)
+
+        return descriptor
+
+
+    def __len__(self):
+        with self.__mutex:
+            return len(self.__entries)
+
+
+class discoveryIndex():
+
+    def __init__(self):
+        self.__entries = {}
+        self.__keys = [{} for field in range(5)]
+        self.__bundles = {}
+        self.__generation = 0
+        self.__sync_time = 0
 
 
     @property
-    def name(self):
-        return self.__shared.name
+    def generation(self):
+        return self.__generation
 
 
     @property
-    def mac(self):
-        return self.__shared.mac
+    def syncTime(self):
+        return self.__sync_time
+
+
+    def update(self, client_id, path, data):
+
+        path_split = path.split("/")
+        if len(path_split) < 6 or path_split[0] != constants.PREFIX:
+            return [], []
+
+        self.__generation += 1
+        if path_split[3] != constants.BUNDLE_LEVEL:
+            self.__updateEntry(client_id, path, path_split, data)
+            return [(path, data)], []
+
+
+        # Bundle members are indexed as entries of the bundle
+        try:
+            members = json.loads(data[0])
+
+        except:
+            members = {}
+
+        bundle_id = client_id + "/" + path
+        old_members = self.__bundles.get(bundle_id, {})
+        self.__bundles[bundle_id] = members
+
+        updated = []
+        for member_path in members:
+            if old_members.get(member_path) != members[member_path]:
+                member_split = member_path.split("/")
+                if len(member_split) >= 6 and member_split[0] == constants.PREFIX and member_split[3] != constants.BUNDLE_LEVEL:
+                    self.__updateEntry(bundle_id, member_path, member_split, members[member_path])
+                    updated.append((member_path, members[member_path]))
+
+        removed = []
+        for member_path in old_members:
+            if member_path not in members:
+                entry = self.__entries.get(member_path)
+                latest = None if entry == None else next(reversed(entry.data.values()))
+                if not self.__removeEntry(bundle_id, member_path):
+                    continue
+
+                # Members moved out of the bundle are still published by their own entry
+                entry = self.__entries.get(member_path)
+                if entry == None:
+                    removed.append(member_path)
+
+                elif next(reversed(entry.data.values())) != latest:
+                    updated.append((member_path, next(reversed(entry.data.values()))))
+
+        return updated, removed
+
+
+    def remove(self, client_id, path):
+
+        bundle_id = client_id + "/" + path
+        if bundle_id in self.__bundles:
+            self.__generation += 1
+            return [member_path for member_path in self.__bundles.pop(bundle_id) if self.__removeEntry(bundle_id, member_path)]
+
+        elif self.__removeEntry(client_id, path):
+            self.__generation += 1
+            return [path]
+
+        return []
+
+
+    def __updateEntry(self, client_id, path, path_split, data):
+
+        entry = self.__entries.get(path)
+        if entry == None:
+            entry = container()
+            entry.fields = path_split[1:6]
+            entry.data = {}
+            self.__entries[path] = entry
+
+            for index, value in enumerate(entry.fields):
+                self.__keys[index].setdefault(value, set()).add(path)
+
+        # Last updated client first
+        entry.data.pop(client_id, None)
+        entry.data[client_id] = data
+
+
+    def __removeEntry(self, client_id, path):
+
+        entry = self.__entries.get(path)
+        if entry == None or client_id not in entry.data:
+            return False
+
+        del entry.data[client_id]
+        if len(entry.data) > 0:
+            return True
 
+        del self.__entries[path]
+        for index, value in enumerate(entry.fields):
+            paths = self.__keys[index][value]
+            paths.discard(path)
+            if len(paths) == 0:
+                del self.__keys[index][value]
 
-    @property
-    def ip(self):
-        return self.__shared.ip
+        return True
 
 
-    @property
-    def service(self):
-        return self.__shared.service
+    def rebuild(self, map_data):
 
+        self.__entries = {}
+        self.__keys = [{} for field in range(5)]
+        self.__bundles = {}
+        for client_id in map_data:
+            for path in map_data[client_id]:
+                self.update(client_id, path, map_data[client_id][path])
 
-    @property
-    def category(self):
-        return self.__shared.category
+        self.__sync_time = time.time()
 
 
-    @property
-    def value(self):
-        with self.__shared.value_mutex:
-            return self.__shared.value
+    def find(self, mac, service, mode, category, name) -> list:
 
+        patterns = [field.replace("/", "-") for field in [mac, service, mode, category, name]]
+        wildcards = [any(char in pattern for char in "*?[") for pattern in patterns]
 
-    @property
-    def valueType(self):
-        return self.__shared.valueType
 
+        # Start from the smallest exact match
+        candidates = None
+        for index, pattern in enumerate(patterns):
+            if pattern != "" and not wildcards[index]:
+                paths = self.__keys[index].get(pattern, ())
+                if candidates == None or len(paths) < len(candidates):
+                    candidates = paths
 
-    @property
-    def epoch(self):
-        with self.__shared.value_mutex:
-            return self.__shared.epoch
+        if candidates == None:
+            candidates = self.__entries.keys()
 
 
-    @property
-    def online(self):
-        with self.__shared.value_mutex:
-            return self.value != None
+        entries = []
+        for path in candidates:
+            entry = self.__entries[path]
+            for index, pattern in enumerate(patterns):
+                if pattern == "" or (wildcards[index] and fnmatch.fnmatchcase(entry.fields[index], pattern)) or entry.fields[index] == pattern:
+                    continue
+                break
 
+            else:
+                entries.append((path, next(reversed(entry.data.values()))))
 
-    def addOnUpdateCallback(self, callback):
-        weak_ptr = weakref.ref(callback)
-        with self.__shared.callback_mutex:
-            if weak_ptr not in self.__shared.on_update_callback_list:
-                self.__shared.on_update_callback_list.append(weak_ptr)
+        return entries
 
 
 class d2d():
@@ -1206,6 +3981,8 @@ class d2d():
 
         self.__shared.__callback_mutex = threading.RLock()
         self.__shared.__registered_mutex = threading.RLock()
+        self.__shared.__registered_condition = threading.Condition(self.__shared.__registered_mutex)
+        self.__shared.__index_watchers = []
 
         self.__shared.__command_update_callback = None
         self.__shared.__command_remove_callback = None
@@ -1217,9 +3994,21 @@ class d2d():
 
         self.__service_used_paths = {}
         self.__info_writer_objects = {}
+        self.__info_publisher = None
+
+        self.__publish_mutex = threading.RLock()
+        self.__batch = None
+        self.__batch_paths = []
+        self.__batch_rollbacks = []
+        self.__bundles = {}
+        self.__bundled_paths = {}
+        self.__standalone_paths = set()
+        self.__next_bundle = 0
 
         self.__shared.__commands = {}
         self.__shared.info_readers = {}
+        self.__shared.index = discoveryIndex()
+        self.__shared.descriptors = descriptorCache()
 
         self.__shared_table = SharedTableBroker.SharedTableBroker(constants.BROKER_SERVICE_NAME, master, False)
         self.__shared_table.onRemoveTableEntry = lambda client_id, entry_key, shared=self.__shared : d2d.__entryRemoved(client_id, entry_key, shared)
@@ -1335,6 +4124,37 @@ class d2d():
 
     def __entryRemoved(client_id, entry_key, shared):
 
+        with shared.__registered_condition:
+            removed = shared.index.remove(client_id, entry_key)
+            shared.__registered_condition.notify_all()
+            watchers = list(shared.__index_watchers)
+
+        for watcher in watchers:
+            watcher()
+
+        for path in removed:
+            d2d.__pathRemoved(path, shared)
+
+
+    def __entryUpdated(client_id, entry_key, data, shared):
+
+        with shared.__registered_condition:
+            updated, removed = shared.index.update(client_id, entry_key, data)
+            shared.__registered_condition.notify_all()
+            watchers = list(shared.__index_watchers)
+
+        for watcher in watchers:
+            watcher()
+
+        for path in removed:
+            d2d.__pathRemoved(path, shared)
+
+        for path, path_data in updated:
+            d2d.__pathUpdated(path, path_data, shared)
+
+
+    def __pathRemoved(entry_key, shared):
+
         path_info = d2d.__extractPathInfo(entry_key)
         if path_info.mode == constants.COMMAND_LEVEL:
 
@@ -1356,7 +4176,7 @@ class d2d():
                 if entry_key in shared.info_readers:
                     shared_ptr = shared.info_readers[entry_key]()
                     if shared_ptr:
-                        shared_ptr.configure(None, None, None)
+                        shared_ptr.configure(None, None, None, None)
 
 
             # Notify
@@ -1365,19 +4185,19 @@ class d2d():
                     shared.__info_remove_callback(path_info.mac, path_info.service, path_info.category, path_info.name)
 
 
-    def __entryUpdated(client_id, entry_key, data, shared):
+    def __pathUpdated(entry_key, data, shared):
 
         path_info = d2d.__extractPathInfo(entry_key)
         updated = False
         if path_info.mode == constants.COMMAND_LEVEL:
 
-            command_info = d2d.__extractCommandInfo(data[0])
+            command_info = shared.descriptors.get(entry_key, data[0], d2d.__extractCommandInfo)
 
             with shared.__registered_mutex:
                 if entry_key in shared.__commands:
                     shared_ptr = shared.__commands[entry_key]()
                     if shared_ptr:
-                        shared_ptr.configure(command_info.enable, command_info.params, command_info.response, command_info.protocol, command_info.ip, command_info.port, command_info.timeout)
+                        shared_ptr.configure(command_info.enable, command_info.params, command_info.response, command_info.protocol, command_info.ip, command_info.port, command_info.timeout, command_info.mtu)
                         updated = True
 
 
@@ -1394,13 +4214,13 @@ class d2d():
 
         elif path_info.mode == constants.INFO_LEVEL:
 
-            info_description = d2d.__extractInfoDescription(data[0])
+            info_description = shared.descriptors.get(entry_key, data[0], d2d.__extractInfoDescription)
 
             with shared.__registered_mutex:
                 if entry_key in shared.info_readers:
                     shared_ptr = shared.info_readers[entry_key]()
                     if shared_ptr:
-                        shared_ptr.configure(info_description.ip, info_description.req_port, info_description.update_port)
+                        shared_ptr.configure(info_description.ip, info_description.req_port, info_description.update_port, info_description.id, info_description.protocol)
                         updated = True
 
             # Notify
@@ -1469,82 +4289,103 @@ class d2d():
         return True
 
 
-    def __checkInOutField(data_dict, prototipe_dict) -> bool:
+    def __jsonCommandRequest(request, service_container, command_callback, input_validator, output_validator):
 
-        # Chect type and non-exists
-        for field in data_dict:
-            if field not in prototipe_dict:
-                return False
-            if not typeTools.checkFieldType(data_dict[field], prototipe_dict[field][constants.field.TYPE]):
-                return False
+            start = time.perf_counter()
+            request_id, response = d2d.__commandRequest(request, service_container, command_callback, input_validator, output_validator)
 
-        # Check optional
-        for field in prototipe_dict:
-            field_prototipe = prototipe_dict[field]
-            mandatory = constants.field.OPTIONAL not in field_prototipe or not field_prototipe[constants.field.OPTIONAL]
-            if field not in data_dict and mandatory:
-                return False
+            metrics = metricsRegistry.get()
+            metrics.count("command.requests", service_container.metric_labels)
+            if not isinstance(response, dict):
+                metrics.count("command.errors", service_container.metric_labels + (response,))
+            metrics.observe("command.latency", service_container.metric_labels, time.perf_counter() - start)
 
-        return True
+            return d2d.__jsonCommandResponse(request_id, response)
 
 
-    def __jsonCommandRequest(request, service_container, command_callback, input_params, output_params):
+    def __commandRequest(request, service_container, command_callback, input_validator, output_validator):
 
             # json -> map
             try:
-                args = json.loads(request)
+                envelope = json.loads(request)
+                request_id = envelope[constants.envelopeField.ID]
+                args = envelope[constants.envelopeField.ARGS]
 
             except:
-                return constants.commandErrorMsg.BAD_INPUT
+                return None, constants.commandErrorMsg.BAD_INPUT
 
 
             # Ignore if disable
             if not service_container.map[constants.commandField.ENABLE]:
-                return constants.commandErrorMsg.NOT_ENABLE_ERROR
+                return request_id, constants.commandErrorMsg.NOT_ENABLE_ERROR
 
 
             # Check args
-            if not d2d.__checkInOutField(args, input_params):
-                return constants.commandErrorMsg.BAD_INPUT
+            if not isinstance(args, dict) or (input_validator != None and not input_validator(args)):
+                return request_id, constants.commandErrorMsg.BAD_INPUT
 
 
             # Call command
-            response_dict = command_callback(args)
+            try:
+                response_dict = command_callback(args)
+
+            except:
+                return request_id, constants.commandErrorMsg.EXCEPTION_ERROR
+
             if isinstance(response_dict, dict):
 
                 # Check args
-                if not d2d.__checkInOutField(response_dict, output_params):
-                    return constants.commandErrorMsg.BAD_OUTPUT
+                if output_validator != None and not output_validator(response_dict):
+                    return request_id, constants.commandErrorMsg.BAD_OUTPUT
 
                 else:
-                    # map -> json
-                    response = json.dumps(response_dict, indent=1)
-                    return response
+                    return request_id, response_dict
 
             else:
-                return constants.commandErrorMsg.CALLBACK_ERROR
+                return request_id, constants.commandErrorMsg.CALLBACK_ERROR
+
+
+    def __jsonCommandResponse(request_id, response):
+
+        envelope = {}
+        envelope[constants.envelopeField.ID] = request_id
+        if isinstance(response, dict):
+            envelope[constants.envelopeField.RESPONSE] = response
 
+        else:
+            envelope[constants.envelopeField.ERROR] = response
+
+        # map -> json
+        return json.dumps(envelope)
 
-    def __udpListenerThread(socket, service_container, command_callback, input_params, output_params):
+
+    def __udpListenerThread(socket, service_container, command_callback, input_validator, output_validator, mtu):
 
         while service_container.run:
-            request, ip, port = socket.read()
+            request, ip, port = socket.readMessage()
             if not request:
                 break
 
-            response = d2d.__jsonCommandRequest(request, service_container, command_callback, input_params, output_params)
-            try:
-                socket.send(ip, port, response)
-
-            except:
-                pass
+            # Drop request if workers are saturated
+            service_container.dispatcher.submit(lambda request=request, ip=ip, port=port : d2d.__udpRequestTask(socket, ip, port, request, service_container, command_callback, input_validator, output_validator, mtu), False)
 
         socket.close()
+        service_container.dispatcher.stop()
+
 
+    def __udpRequestTask(socket, ip, port, request, service_container, command_callback, input_validator, output_validator, mtu):
+
+        response = d2d.__jsonCommandRequest(request, service_container, command_callback, input_validator, output_validator)
+        try:
+            socket.sendMessage(ip, port, response, mtu)
+
+        except:
+            pass
 
-    def __tcpListenerThread(socket, service_container, command_callback, input_params, output_params):
 
-        mutex = threading.Lock()
+    def __tcpListenerThread(socket, service_container, command_callback, input_validator, output_validator, framed):
+
+        dispatcher = service_container.dispatcher
         threads_list = []
         while service_container.run:
 
@@ -1554,9 +4395,11 @@ class d2d():
                 break
 
             # Launch thread
-            thread = threading.Thread(target=d2d.__tcpConnectionThread, daemon=True, args=[connection, service_container, command_callback, input_params, output_params, mutex])
+            thread = threading.Thread(target=d2d.__tcpConnectionThread, daemon=True, args=[connection, service_container, command_callback, input_validator, output_validator, dispatcher, framed])
             thread.start()
 
+            # Reap closed connections
+            threads_list = [thread for thread in threads_list if thread.is_alive()]
             threads_list.append(thread)
 
         # Wait connection threads
@@ -1564,26 +4407,51 @@ class d2d():
         for thread in threads_list:
             thread.join()
 
+        dispatcher.stop()
 
-    def __tcpConnectionThread(connection, service_container, command_callback, input_params, output_params, mutex):
 
-        while service_container.run:
+    def __tcpConnectionThread(connection, service_container, command_callback, input_validator, output_validator, dispatcher, framed):
 
-            request = connection.read()
-            if not request:
-                break
+        send_mutex = threading.Lock()
+        json_buffer = jsonBuffer()
+        while service_container.run and connection.isConnected():
 
-            with mutex:
-                response = d2d.__jsonCommandRequest(request, service_container, command_callback, input_params, output_params)
-                try:
-                    connection.send(response)
+            if framed:
+                request = connection.readFrame(0)
 
-                except:
-                    pass
+            else:
+
+                # Split pipelined requests
+                request = json_buffer.pop()
+                if request == None:
+                    data = connection.read(0, constants.TCP_READ_SIZE)
+                    if data != None:
+                        json_buffer.push(data)
+                    continue
+
+            if request == None:
+                continue
+
+            dispatcher.submit(lambda request=request : d2d.__tcpRequestTask(connection, send_mutex, request, service_container, command_callback, input_validator, output_validator, framed))
 
         connection.close()
 
 
+    def __tcpRequestTask(connection, send_mutex, request, service_container, command_callback, input_validator, output_validator, framed):
+
+        response = d2d.__jsonCommandRequest(request, service_container, command_callback, input_validator, output_validator)
+        with send_mutex:
+            try:
+                if framed:
+                    connection.sendFrame(response)
+
+                else:
+                    connection.send(response)
+
+            except:
+                pass
+
+
     def __extractCommandInfo(data):
 
         try:
@@ -1592,10 +4460,11 @@ class d2d():
             rc.protocol = command_info[constants.commandField.PROTOCOL]
             rc.ip = command_info[constants.commandField.IP]
             rc.port = command_info[constants.commandField.PORT]
-            rc.params = commandArgsDef(command_info[constants.commandField.INPUT])
-            rc.response = commandArgsDef(command_info[constants.commandField.OUTPUT])
+            rc.params = commandArgsDef.intern(command_info[constants.commandField.INPUT])
+            rc.response = commandArgsDef.intern(command_info[constants.commandField.OUTPUT])
             rc.enable = True if constants.commandField.ENABLE not in command_info else command_info[constants.commandField.ENABLE]
             rc.timeout = 5 if constants.commandField.TIMEOUT not in command_info else command_info[constants.commandField.TIMEOUT]
+            rc.mtu = None if constants.commandField.MTU not in command_info else command_info[constants.commandField.MTU]
             return rc
 
         except:
@@ -1612,6 +4481,7 @@ class d2d():
             rc.req_port = command_info[constants.infoField.REQUEST_PORT]
             rc.update_port = command_info[constants.infoField.UPDATE_PORT]
             rc.valueType = command_info[constants.infoField.TYPE]
+            rc.id = command_info[constants.infoField.ID]
 
             return rc
 
@@ -1641,22 +4511,10 @@ class d2d():
 
 
     def __getOwnIP(self, dst='127.0.0.1'):
-
-        if not dst:
-            return ""
-
-        elif os.name != 'nt':
-            route_obj = IPRoute()
-            ipr = route_obj.route('get', dst=dst)
-            ip = ipr[0].get_attr('RTA_PREFSRC') if len(ipr) > 0 else "127.0.0.1"
-            route_obj.close()
-            return ip
-
-        else:
-            return ""
+        return ownIPResolver.get().resolve(dst)
 
 
-    def addServiceCommand(self, cmdCallback, name:str, input_params:dict, output_params:dict, category:str="", enable=True, timeout=5, protocol=constants.commandProtocol.JSON_UDP)-> bool:
+    def addServiceCommand(self, cmdCallback, name:str, input_params:dict, output_params:dict, category:str="", enable=True, timeout=5, protocol=constants.commandProtocol.JSON_UDP, concurrency:int=1, queue_size:int=constants.COMMAND_QUEUE_SIZE, validate:bool=True, mtu:int=None)-> bool:
 
         # Checks
         if not cmdCallback:
@@ -1681,31 +4539,46 @@ class d2d():
             return False
 
 
+        # Compile validators once
+        input_validator = commandArgsDef.compile(input_params) if validate else None
+        output_validator = commandArgsDef.compile(output_params) if validate else None
+
+
         # Create listen thread
         self.__service_container[name] = container()
         self.__service_container[name].run = True
+        self.__service_container[name].metric_labels = (self.__mac, self.__service, name)
 
         if protocol == constants.commandProtocol.JSON_UDP:
+            self.__service_container[name].dispatcher = commandDispatcher(concurrency, queue_size)
             listen_socket = udpRandomPortListener()
             self.__command_sockets.append(listen_socket)
-            thread = threading.Thread(target=d2d.__udpListenerThread, daemon=True, args=[listen_socket, self.__service_container[name], cmdCallback, input_params, output_params])
+            thread = threading.Thread(target=d2d.__udpListenerThread, daemon=True, args=[listen_socket, self.__service_container[name], cmdCallback, input_validator, output_validator, mtu])
             thread.start()
             self.__threads.append(thread)
 
-        elif protocol == constants.commandProtocol.JSON_TCP:
+        elif protocol == constants.commandProtocol.JSON_TCP or protocol == constants.commandProtocol.JSON_TCP_FRAMED:
+            self.__service_container[name].dispatcher = commandDispatcher(concurrency, queue_size)
             listen_socket = tcpListener()
             self.__command_sockets.append(listen_socket)
-            thread = threading.Thread(target=d2d.__tcpListenerThread, daemon=True, args=[listen_socket, self.__service_container[name], cmdCallback, input_params, output_params])
+            thread = threading.Thread(target=d2d.__tcpListenerThread, daemon=True, args=[listen_socket, self.__service_container[name], cmdCallback, input_validator, output_validator,
+                protocol == constants.commandProtocol.JSON_TCP_FRAMED])
             thread.start()
             self.__threads.append(thread)
 
         else:
+            del self.__service_container[name]
             return False
 
 
+        self.__service_container[name].socket = listen_socket
+        self.__service_container[name].thread = thread
+
+
         # Register command
         command_path = d2d.createCommandUID(self.__mac, self.__service, category, name)
         if not command_path:
+            self.__rollbackCommand(name)
             return False
 
         self.__service_used_paths[name] = command_path
@@ -1718,69 +4591,290 @@ class d2d():
         self.__service_container[name].map[constants.commandField.OUTPUT] = output_params
         self.__service_container[name].map[constants.commandField.ENABLE] = enable
         self.__service_container[name].map[constants.commandField.TIMEOUT] = timeout
+        if mtu != None:
+            self.__service_container[name].map[constants.commandField.MTU] = mtu
+
+        return self.__publishEntry(self.__service_used_paths[name], [json.dumps(self.__service_container[name].map)], lambda : self.__rollbackCommand(name))
+
+
+    def __rollbackCommand(self, name):
+
+        # Local registration is undone when the command can not be published
+        service = self.__service_container.pop(name)
+        service.run = False
+        service.socket.close()
+        self.__command_sockets.remove(service.socket)
+        self.__threads.remove(service.thread)
+
+        path = self.__service_used_paths.pop(name, None)
+        if path != None:
+            self.__forgetEntry(path)
+
+
+    def addServiceCommands(self, commands:list) -> list:
+        return self.__publishBatch([lambda command=command : self.addServiceCommand(**command) for command in commands], False)
+
+
+    def getCommandQueueStats(self, name):
+        if name not in self.__service_container:
+            return None
+
+        dispatcher = self.__service_container[name].dispatcher
+        stats = container()
+        stats.workers = dispatcher.workers
+        stats.depth = dispatcher.depth
+        stats.max_depth = dispatcher.maxDepth
+        stats.capacity = dispatcher.capacity
+        stats.dropped = dispatcher.dropped
+        return stats
+
+
+    @property
+    def metrics(self):
+        return metricsRegistry.get()
+
+
+    def getMetrics(self) -> dict:
+        return metricsRegistry.get().snapshot()
+
 
-        return self.__shared_table.updateTableEntry(self.__service_used_paths[name], [json.dumps(self.__service_container[name].map)])
+    def exportMetrics(self) -> str:
+        return metricsRegistry.get().export()
 
 
     def enableCommand(self, name, enable):
         if name not in self.__service_container:
             return False
 
+        previous = self.__service_container[name].map[constants.commandField.ENABLE]
         self.__service_container[name].map[constants.commandField.ENABLE] = enable
-        return self.__shared_table.updateTableEntry(self.__service_used_paths[name], [json.dumps(self.__service_container[name].map)])
+        return self.__publishEntry(self.__service_used_paths[name], [json.dumps(self.__service_container[name].map)], lambda : self.__rollbackEnable(name, previous))
 
 
-    def getAvailableComands(self, name:str="", service:str="", category:str="", mac:str="", wait:int=0) -> list:
+    def __rollbackEnable(self, name, enable):
+
+        # Local state must match the shared table after a failed publish
+        if name not in self.__service_container:
+            return
+
+        self.__service_container[name].map[constants.commandField.ENABLE] = enable
+        path = self.__service_used_paths[name]
+        if path in self.__bundled_paths:
+            self.__bundles[self.__bundled_paths[path]][path] = [json.dumps(self.__service_container[name].map)]
+
+
+    def enableCommands(self, enables:dict) -> bool:
+        return all(self.__publishBatch([lambda name=name : self.enableCommand(name, enables[name]) for name in enables], False))
 
-        search_command_path = d2d.createCommandUID(mac, service, category, name)
+
+    def __publishEntry(self, path, data, rollback=None) -> bool:
+
+        with self.__publish_mutex:
+            if self.__batch != None:
+                self.__batch[path] = data
+                self.__batch_paths.append(path)
+                if rollback != None:
+                    self.__batch_rollbacks.append((path, rollback))
+                return True
+
+            if len(self.__publishEntries({path: data}, False)) == 0:
+                return True
+
+            if rollback != None:
+                rollback()
+            return False
+
+
+    def __forgetEntry(self, path):
+
+        bundle_path = self.__bundled_paths.pop(path, None)
+        if bundle_path != None:
+            del self.__bundles[bundle_path][path]
+            if len(self.__bundles[bundle_path]) == 0:
+                del self.__bundles[bundle_path]
+
+        self.__standalone_paths.discard(path)
+
+
+    def __newBundle(self, entries, updated_bundles):
+
+        bundle_path = "/".join([constants.MQTT_PREFIX, self.__mac.replace("/", "-"), self.__service.replace("/", "-"), constants.BUNDLE_LEVEL, constants.BUNDLE_LEVEL, str(self.__next_bundle)])
+        self.__next_bundle += 1
+        self.__bundles[bundle_path] = entries
+        for path in entries:
+            self.__bundled_paths[path] = bundle_path
+
+        updated_bundles[bundle_path] = list(entries)
+
+
+    def __publishEntries(self, entries, bundle) -> set:
+
+        failed = set()
+        new_bundle = {}
+        new_bundle_size = 0
+        updated_bundles = {}
+        for path in entries:
+
+            # Batches update entries in the bundle they were first published in
+            if path in self.__bundled_paths and bundle:
+                bundle_path = self.__bundled_paths[path]
+                self.__bundles[bundle_path][path] = entries[path]
+                updated_bundles.setdefault(bundle_path, []).append(path)
+
+            # Single updates move the entry out of its bundle, so later updates are published alone
+            elif path in self.__bundled_paths:
+                bundle_path = self.__bundled_paths.pop(path)
+                del self.__bundles[bundle_path][path]
+                self.__standalone_paths.add(path)
+                if not self.__shared_table.updateTableEntry(path, entries[path]):
+                    failed.add(path)
+                updated_bundles.setdefault(bundle_path, []).append(path)
+
+            elif not bundle or path in self.__standalone_paths:
+                self.__standalone_paths.add(path)
+                if not self.__shared_table.updateTableEntry(path, entries[path]):
+                    failed.add(path)
+
+            # Many entries, few table publishes of bounded size
+            else:
+                size = len(json.dumps(path)) + len(json.dumps(entries[path])) + 2
+                if len(new_bundle) > 0 and new_bundle_size + size > constants.BUNDLE_MAX_SIZE:
+                    self.__newBundle(new_bundle, updated_bundles)
+                    new_bundle = {}
+                    new_bundle_size = 0
+
+                new_bundle[path] = entries[path]
+                new_bundle_size += size
+
+        if len(new_bundle) > 0:
+            self.__newBundle(new_bundle, updated_bundles)
+
+        for bundle_path, paths in updated_bundles.items():
+            if not self.__shared_table.updateTableEntry(bundle_path, [json.dumps(self.__bundles[bundle_path])]):
+                failed.update(paths)
+
+        return failed
+
+
+    def __publishBatch(self, calls, error_value) -> list:
+
+        with self.__publish_mutex:
+            if self.__batch != None:
+                return [call() for call in calls]
+
+            self.__batch = {}
+            self.__batch_rollbacks = []
+            results = []
+            call_paths = []
+            try:
+                for call in calls:
+                    self.__batch_paths = []
+                    results.append(call())
+                    call_paths.append(self.__batch_paths)
+
+            finally:
+                entries = self.__batch
+                rollbacks = self.__batch_rollbacks
+                self.__batch = None
+                self.__batch_paths = []
+                self.__batch_rollbacks = []
+
+            # Only entries whose publish failed are rolled back
+            failed = self.__publishEntries(entries, True)
+            for path, rollback in reversed(rollbacks):
+                if path in failed:
+                    rollback()
+
+            return [error_value if any(path in failed for path in paths) else result for result, paths in zip(results, call_paths)]
+
+
+    def __syncIndex(self):
+
+        # Entries dropped by the broker without remove notification
+        with self.__shared.__registered_mutex:
+            if time.time() - self.__shared.index.syncTime < constants.INDEX_RESYNC_TIME:
+                return
+
+            generation = self.__shared.index.generation
+
+        d2d_map = self.__shared_table.geMapData()
+        with self.__shared.__registered_mutex:
+            if generation == self.__shared.index.generation:
+                self.__shared.index.rebuild(d2d_map)
+
+
+    def addIndexWatcher(self, callback):
+        with self.__shared.__registered_mutex:
+            self.__shared.__index_watchers.append(callback)
+
+
+    def removeIndexWatcher(self, callback):
+        with self.__shared.__registered_mutex:
+            if callback in self.__shared.__index_watchers:
+                self.__shared.__index_watchers.remove(callback)
+
+
+    def __waitIndexChange(self, generation, timeout):
+
+        # Woken up by the table hooks
+        with self.__shared.__registered_condition:
+            if generation == self.__shared.index.generation:
+                self.__shared.__registered_condition.wait(timeout)
+
+
+    def getAvailableComands(self, name:str="", service:str="", category:str="", mac:str="", wait:int=0) -> list:
 
         commands = []
         start = time.time()
 
         # Get commands from table
         while True:
+            self.__syncIndex()
             with self.__shared.__registered_mutex:
-                d2d_map = self.__shared_table.geMapData()
-                for client in d2d_map:
-                    for d2d_path in d2d_map[client]:
-                        if re.search(search_command_path, d2d_path):
+                generation = self.__shared.index.generation
+                for d2d_path, data in self.__shared.index.find(mac, service, constants.COMMAND_LEVEL, category, name):
 
-                            # Command already setup
-                            if d2d_path in self.__shared.__commands:
-                                command_object = self.__shared.__commands[d2d_path]()
+                    # Command already setup
+                    if d2d_path in self.__shared.__commands:
+                        command_object = self.__shared.__commands[d2d_path]()
 
-                            else:
-                                command_object = None
+                    else:
+                        command_object = None
 
 
-                            if not command_object:
-                                command_info = d2d.__extractCommandInfo(d2d_map[client][d2d_path][0])
-                                path_info = d2d.__extractPathInfo(d2d_path)
+                    if not command_object:
+                        command_info = self.__shared.descriptors.get(d2d_path, data[0], d2d.__extractCommandInfo)
+                        path_info = d2d.__extractPathInfo(d2d_path)
+                        if not command_info:
+                            continue
 
-                                command_object = commandInterface(path_info.mac, path_info.service, path_info.category, path_info.name,
-                                                            command_info.protocol, command_info.ip, command_info.port, command_info.params,
-                                                            command_info.response, command_info.enable, command_info.timeout)
+                        command_object = commandInterface(path_info.mac, path_info.service, path_info.category, path_info.name,
+                                                    command_info.protocol, command_info.ip, command_info.port, command_info.params,
+                                                    command_info.response, command_info.enable, command_info.timeout, command_info.mtu)
 
 
-                                # Save weak reference
-                                self.__shared.__commands[d2d_path] = weakref.ref(command_object)
+                        # Save weak reference
+                        self.__shared.__commands[d2d_path] = weakref.ref(command_object)
 
-                            # Append to list
-                            commands.append(command_object)
+                    # Append to list
+                    commands.append(command_object)
 
 
             # Check return value
-            end = time.time()
-            if len(commands) > 0 or wait < 0 or (wait > 0 and (end - start) > wait):
+            if len(commands) > 0 or wait < 0 or (wait > 0 and time.time() - start >= wait):
                 break
 
-            else:
-                time.sleep(0.1)
+            self.__waitIndexChange(generation, start + wait - time.time() if wait > 0 else None)
 
         return commands
 
 
-    def addInfoWriter(self, name:str, valueType:str, category:str="", protocol:str=constants.infoProtocol.ASCII) -> infoWriter:
+    def addInfoWriter(self, name:str, valueType:str, category:str="", protocol:str=constants.infoProtocol.ASCII, max_rate:float=0, deadband:float=0, relative_deadband:float=0, refresh:float=0) -> infoWriter:
+
+        # Checks
+        if protocol not in [constants.infoProtocol.ASCII, constants.infoProtocol.BINARY]:
+            return None
+
 
         # Set defaults
         if category == "":
@@ -1790,83 +4884,229 @@ class d2d():
 
 
         with self.__shared.__registered_mutex:
+            self.__getInfoPublisher()
+
             if info_path not in self.__info_writer_objects:
-                info_writer = infoWriter(self.__mac, self.__service, category, name, valueType)
+                info_writer = infoWriter(self.__mac, self.__service, category, name, valueType, self.__info_publisher, protocol, max_rate, deadband, relative_deadband, refresh)
                 self.__info_writer_objects[info_path] = weakref.ref(info_writer)
 
             else:
                 info_writer = self.__info_writer_objects[info_path]()
 
                 if not info_writer:
-                    info_writer = infoWriter(self.__mac, self.__service, category, name, valueType)
+                    info_writer = infoWriter(self.__mac, self.__service, category, name, valueType, self.__info_publisher, protocol, max_rate, deadband, relative_deadband, refresh)
                     self.__info_writer_objects[info_path] = weakref.ref(info_writer)
 
         info_description = {}
-        info_description[constants.infoField.PROTOCOL] = protocol
+        info_description[constants.infoField.PROTOCOL] = info_writer.protocol
         info_description[constants.infoField.IP] = self.__getOwnIP(self.__shared_table.masterIP())
         info_description[constants.infoField.REQUEST_PORT] = info_writer.requestPort
         info_description[constants.infoField.UPDATE_PORT] = info_writer.updatePort
         info_description[constants.infoField.TYPE] = valueType
+        info_description[constants.infoField.ID] = info_writer.id
+
 
+        # Only new entries are forgotten if the publish fails
+        with self.__publish_mutex:
+            published = info_path in self.__bundled_paths or info_path in self.__standalone_paths
 
-        if self.__shared_table.updateTableEntry(info_path, [json.dumps(info_description)]):
+        rollback = None if published else lambda : self.__forgetEntry(info_path)
+        if self.__publishEntry(info_path, [json.dumps(info_description)], rollback):
             return info_writer
 
         else:
             return None
 
 
-    def getAvailableInfoReaders(self, name:str="", service:str="", category:str="", mac:str="", wait:int=0) -> list:
+    def __getInfoPublisher(self):
+
+        with self.__shared.__registered_mutex:
+            if not self.__info_publisher:
+                self.__info_publisher = infoPublisher()
+
+            return self.__info_publisher
 
 
-        search_info_path = d2d.createInfoWriterUID(mac, service, category, name)
+    @property
+    def publishCycle(self):
+        return self.__getInfoPublisher().publishCycle
+
+
+    @publishCycle.setter
+    def publishCycle(self, cycle):
+        self.__getInfoPublisher().publishCycle = cycle
+
+
+    def transaction(self) -> infoTransaction:
+
+        return infoTransaction(self.__getInfoPublisher())
+
+
+    def addInfoWriters(self, writers:list) -> list:
+        return self.__publishBatch([lambda writer=writer : self.addInfoWriter(**writer) for writer in writers], None)
+
+
+    def getAvailableInfoReaders(self, name:str="", service:str="", category:str="", mac:str="", wait:int=0) -> list:
 
         info_reader_objs = []
         start = time.time()
 
         # Get commands from table
         while True:
+            self.__syncIndex()
             with self.__shared.__registered_mutex:
-                d2d_map = self.__shared_table.geMapData()
-                for client in d2d_map:
-                    for d2d_path in d2d_map[client]:
-                        if re.search(search_info_path, d2d_path):
+                generation = self.__shared.index.generation
+                for d2d_path, data in self.__shared.index.find(mac, service, constants.INFO_LEVEL, category, name):
 
-                            # Command already setup
-                            if d2d_path in self.__shared.info_readers:
-                                info_reader_object = self.__shared.info_readers[d2d_path]()
+                    # Command already setup
+                    if d2d_path in self.__shared.info_readers:
+                        info_reader_object = self.__shared.info_readers[d2d_path]()
 
-                            else:
-                                info_reader_object = None
+                    else:
+                        info_reader_object = None
 
 
-                            if not info_reader_object:
-                                info_description = d2d.__extractInfoDescription(d2d_map[client][d2d_path][0])
-                                path_info = d2d.__extractPathInfo(d2d_path)
+                    if not info_reader_object:
+                        info_description = self.__shared.descriptors.get(d2d_path, data[0], d2d.__extractInfoDescription)
+                        path_info = d2d.__extractPathInfo(d2d_path)
+                        if not info_description:
+                            continue
 
-                                info_reader_object = infoReader(path_info.mac, path_info.service, path_info.category, path_info.name,
-                                    info_description.valueType, info_description.ip, info_description.req_port, info_description.update_port)
+                        info_reader_object = infoReader(path_info.mac, path_info.service, path_info.category, path_info.name,
+                            info_description.valueType, info_description.ip, info_description.req_port, info_description.update_port,
+                            info_description.id, info_description.protocol)
 
 
-                                # Save weak reference
-                                self.__shared.info_readers[d2d_path] = weakref.ref(info_reader_object)
+                        # Save weak reference
+                        self.__shared.info_readers[d2d_path] = weakref.ref(info_reader_object)
 
 
-                            # Append to list
-                            info_reader_objs.append(info_reader_object)
+                    # Append to list
+                    info_reader_objs.append(info_reader_object)
 
 
             # Check return value
-            end = time.time()
-            if len(info_reader_objs) > 0 or wait < 0 or (wait > 0 and (end - start) > wait):
+            if len(info_reader_objs) > 0 or wait < 0 or (wait > 0 and time.time() - start >= wait):
                 break
 
-            else:
-                time.sleep(0.1)
+            self.__waitIndexChange(generation, start + wait - time.time() if wait > 0 else None)
 
         return info_reader_objs
 
 
     def waitThreads(self):
         for thread in self.__threads:
-            thread.join()
\ No newline at end of file
+            thread.join()
+
+
+class asyncInfoStream():
+
+    def __init__(self, readers:list, queue_size:int=constants.INFO_STREAM_QUEUE_SIZE):
+        self.__loop = asyncio.get_running_loop()
+        self.__queue = asyncio.Queue(max(1, queue_size))
+        self.__callbacks = []
+        self.__closed = False
+
+        for reader in readers:
+            callback = lambda reader=reader, loop=self.__loop, queue=self.__queue : asyncInfoStream.__notify(loop, queue, reader)
+            reader.addOnUpdateCallback(callback)
+
+            # Readers only keep weak references
+            self.__callbacks.append(callback)
+
+
+    def __notify(loop, queue, reader):
+        try:
+            loop.call_soon_threadsafe(asyncInfoStream.__put, queue, reader)
+
+        except RuntimeError:
+            pass
+
+
+    def __put(queue, reader):
+
+        # Slow consumers lose the oldest updates
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(reader)
+
+
+    def close(self):
+        if not self.__closed:
+            self.__closed = True
+            self.__callbacks = []
+            asyncInfoStream.__put(self.__queue, None)
+
+
+    def __aiter__(self):
+        return self
+
+
+    async def __anext__(self) -> infoReader:
+        if self.__closed and self.__queue.empty():
+            raise StopAsyncIteration
+
+        reader = await self.__queue.get()
+        if reader == None:
+            raise StopAsyncIteration
+
+        return reader
+
+
+class asyncD2D():
+
+    def __init__(self, d2d_object:d2d):
+        self.__d2d = d2d_object
+
+
+    @property
+    def d2d(self):
+        return self.__d2d
+
+
+    async def __wait(self, lookup, wait):
+
+        loop = asyncio.get_running_loop()
+        start = time.time()
+        while True:
+
+            # Table hooks wake the loop on index changes
+            changed = loop.create_future()
+            watcher = lambda : asyncD2D.__wake(loop, changed)
+            self.__d2d.addIndexWatcher(watcher)
+            try:
+                objects = await loop.run_in_executor(None, lookup)
+
+                # Check return value
+                remaining = None if wait == 0 else start + wait - time.time()
+                if len(objects) > 0 or wait < 0 or (remaining != None and remaining <= 0):
+                    return objects
+
+                try:
+                    await asyncio.wait_for(changed, remaining)
+
+                except asyncio.TimeoutError:
+                    pass
+
+            finally:
+                self.__d2d.removeIndexWatcher(watcher)
+
+
+    def __wake(loop, future):
+        try:
+            loop.call_soon_threadsafe(lambda : future.done() or future.set_result(None))
+
+        except RuntimeError:
+            pass
+
+
+    async def getAvailableComands(self, name:str="", service:str="", category:str="", mac:str="", wait:int=0) -> list:
+        return await self.__wait(lambda : self.__d2d.getAvailableComands(name, service, category, mac, -1), wait)
+
+
+    async def getAvailableInfoReaders(self, name:str="", service:str="", category:str="", mac:str="", wait:int=0) -> list:
+        return await self.__wait(lambda : self.__d2d.getAvailableInfoReaders(name, service, category, mac, -1), wait)
+
+
+    def infoUpdates(self, readers:list, queue_size:int=constants.INFO_STREAM_QUEUE_SIZE) -> asyncInfoStream:
+        return asyncInfoStream(readers, queue_size)
@@ -21,6 +21,8 @@ import d2dcn
 import time
 import weakref
 import threading
+import asyncio
+import json
 
 class container():
     pass
@@ -370,6 +372,1369 @@ class d2dcnTest(unittest.TestCase):
             pass
 
 
+    def test5_sharedReceiver(self):
+
+        test1 = d2dcn.d2d(service="test5_sharedReceiver_A")
+        test2 = d2dcn.d2d(service="test5_sharedReceiver_B")
+
+        writers = []
+        for i in range(20):
+            writers.append(test1.addInfoWriter("shared receiver " + str(i), d2dcn.constants.valueTypes.INT, d2dcnTest.category))
+
+
+        # Get readers. Only the process receiver thread could be launched
+        thread_count = threading.active_count()
+        readers = []
+        start = time.time()
+        while len(readers) < len(writers) and time.time() - start < 5:
+            readers = test2.getAvailableInfoReaders(name="shared receiver*", service="test5_sharedReceiver_A", wait=5)
+        self.assertTrue(len(readers) == len(writers), "Reader info elements not found")
+        self.assertTrue(threading.active_count() <= thread_count + 1, "Readers should not launch threads")
+
+
+        # Check all readers are updated
+        wait_mutex = threading.Semaphore(0)
+        callback = lambda wait_mutex=wait_mutex : wait_mutex.release()
+        for reader in readers:
+            reader.addOnUpdateCallback(callback)
+
+        for writer in writers:
+            writer.value = 10
+
+        for reader in readers:
+            while reader.value != 10:
+                self.assertTrue(wait_mutex.acquire(timeout=5), "Writer value update not received")
+
+
+    def test6_sharedPublisher(self):
+
+        test1 = d2dcn.d2d(service="test6_sharedPublisher_A")
+        test2 = d2dcn.d2d(service="test6_sharedPublisher_B")
+
+        first_writer = test1.addInfoWriter("shared publisher first", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+
+
+        # Writers must not launch threads nor open sockets
+        publisher = test1._d2d__info_publisher
+        publisher_thread = publisher._infoPublisher__thread
+        writers = []
+        for i in range(100):
+            writers.append(test1.addInfoWriter("shared publisher " + str(i), d2dcn.constants.valueTypes.FLOAT, d2dcnTest.category))
+        self.assertTrue(test1._d2d__info_publisher is publisher and publisher._infoPublisher__thread is publisher_thread, "Writers should not launch threads")
+
+        for writer in writers:
+            self.assertTrue(writer._infoWriter__publisher is publisher, "Writers should share publisher")
+            self.assertTrue(writer.requestPort == first_writer.requestPort, "Writers should share request port")
+            self.assertTrue(writer.updatePort == first_writer.updatePort, "Writers should share update port")
+
+
+        # Check values are routed to the right reader
+        readers = test2.getAvailableInfoReaders(name="shared publisher 1", service="test6_sharedPublisher_A", wait=5)
+        self.assertTrue(len(readers) > 0, "Reader info element not found")
+
+        wait_mutex = threading.Semaphore(0)
+        callback = lambda wait_mutex=wait_mutex : wait_mutex.release()
+        readers[0].addOnUpdateCallback(callback)
+
+        writers[0].value = 0.5
+        writers[1].value = 1.5
+        while readers[0].value != writers[1].value:
+            self.assertTrue(wait_mutex.acquire(timeout=5), "Writer value update not received")
+
+
+    def test7_binaryProtocol(self):
+
+        # Encode / decode
+        values = {}
+        values[d2dcn.constants.valueTypes.INT] = -10
+        values[d2dcn.constants.valueTypes.FLOAT] = 10.10
+        values[d2dcn.constants.valueTypes.STRING] = "test"
+        values[d2dcn.constants.valueTypes.BOOL] = True
+        values[d2dcn.constants.valueTypes.INT_ARRAY] = [10, -20]
+        values[d2dcn.constants.valueTypes.FLOAT_ARRAY] = [10.10, 20.20]
+        values[d2dcn.constants.valueTypes.STRING_ARRAY] = ["test1", "", "test2"]
+        values[d2dcn.constants.valueTypes.BOOL_ARRAY] = [True, False]
+        for value_type in values:
+            data = d2dcn.typeTools.convertToBinary(values[value_type], value_type)
+            self.assertTrue(isinstance(data, bytes), "Value should be encoded")
+            self.assertTrue(d2dcn.typeTools.convertFromBinary(data, value_type) == values[value_type], "Decoded value should be equal")
+
+        self.assertTrue(d2dcn.typeTools.convertFromBinary(b"", d2dcn.constants.valueTypes.FLOAT_ARRAY) == [], "Empty array should be decoded")
+        self.assertTrue(d2dcn.typeTools.convertFromBinary(b"\x01", d2dcn.constants.valueTypes.FLOAT) == None, "Invalid data should not be decoded")
+
+
+        # Share binary value
+        test1 = d2dcn.d2d(service="test7_binaryProtocol_A")
+        test2 = d2dcn.d2d(service="test7_binaryProtocol_B")
+
+        writer = test1.addInfoWriter("binary float array", d2dcn.constants.valueTypes.FLOAT_ARRAY, d2dcnTest.category, d2dcn.constants.infoProtocol.BINARY)
+        self.assertTrue(writer != None, "Error crearing info writer object")
+
+        readers = test2.getAvailableInfoReaders(name="binary float array", service="test7_binaryProtocol_A", wait=5)
+        self.assertTrue(len(readers) > 0, "Reader info element not found")
+        self.assertTrue(readers[0].protocol == d2dcn.constants.infoProtocol.BINARY, "Reader should use writer protocol")
+
+        wait_mutex = threading.Semaphore(0)
+        callback = lambda wait_mutex=wait_mutex : wait_mutex.release()
+        readers[0].addOnUpdateCallback(callback)
+
+        writer.value = [1.5, 2.5, 3.5]
+        while readers[0].value != writer.value:
+            self.assertTrue(wait_mutex.acquire(timeout=5), "Writer value update not received")
+
+
+    def test8_framedCommand(self):
+
+        test1 = d2dcn.d2d(service="test8_framedCommand_A")
+        test2 = d2dcn.d2d(service="test8_framedCommand_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.STRING_ARRAY)
+        api.add("arg2", d2dcn.constants.valueTypes.FLOAT_ARRAY)
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "framed command", api, api, d2dcnTest.category, protocol=d2dcn.constants.commandProtocol.JSON_TCP_FRAMED), "Error adding command")
+
+        comands = test2.getAvailableComands(name="framed command", wait=5)
+        self.assertTrue(len(comands) > 0, "Not found command")
+        self.assertTrue(comands[0].protocol == d2dcn.constants.commandProtocol.JSON_TCP_FRAMED, "Incorrect protocol")
+
+
+        # Payloads larger than the MTU
+        params = {}
+        params["arg1"] = ["item " + str(i) for i in range(5000)]
+        params["arg2"] = [i * 0.5 for i in range(5000)]
+        for i in range(3):
+            result = comands[0].call(params)
+            self.assertTrue(result.success, "Commnd should be success")
+            self.assertTrue(result == params, "Input params should be equal to output params")
+
+
+        # Errors are framed too
+        result = comands[0].call({})
+        self.assertFalse(result.success, "Command must fail if any of the non-optinal paramas are missing")
+        self.assertTrue(result.error == d2dcn.constants.commandErrorMsg.BAD_INPUT, "Incorrect error")
+
+
+    def test9_concurrentCalls(self):
+
+        test1 = d2dcn.d2d(service="test9_concurrentCalls_A")
+        test2 = d2dcn.d2d(service="test9_concurrentCalls_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+
+        protocols = [d2dcn.constants.commandProtocol.JSON_UDP, d2dcn.constants.commandProtocol.JSON_TCP, d2dcn.constants.commandProtocol.JSON_TCP_FRAMED]
+        for protocol in protocols:
+            self.assertTrue(test1.addServiceCommand(lambda args : args, "concurrent " + protocol, api, api, d2dcnTest.category, protocol=protocol), "Error adding command")
+
+        for protocol in protocols:
+            comands = test2.getAvailableComands(name="concurrent " + protocol, wait=5)
+            self.assertTrue(len(comands) > 0, "Not found command")
+
+
+            # Many threads sharing the same command object
+            results = {}
+            def callThread(index, comand=comands[0], results=results):
+                for i in range(10):
+                    results[(index, i)] = comand.call({"arg1": index * 100 + i})
+
+            threads = [threading.Thread(target=callThread, args=[index]) for index in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            for (index, i), result in results.items():
+                self.assertTrue(result.success, "Commnd should be success")
+                self.assertTrue(result["arg1"] == index * 100 + i, "Response should match its request")
+
+
+            # Many requests from one thread
+            args_list = [{"arg1": i} for i in range(50)] + [{}]
+            results = comands[0].callBatch(args_list)
+            self.assertTrue(len(results) == len(args_list), "All requests should be answered")
+            for args, result in zip(args_list[:-1], results[:-1]):
+                self.assertTrue(result.success, "Commnd should be success")
+                self.assertTrue(result == args, "Response should match its request")
+            self.assertTrue(results[-1].error == d2dcn.constants.commandErrorMsg.BAD_INPUT, "Incorrect error")
+
+
+    def test10_asyncAPI(self):
+
+        test1 = d2dcn.d2d(service="test10_asyncAPI_A")
+        test2 = d2dcn.asyncD2D(d2dcn.d2d(service="test10_asyncAPI_B"))
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+
+        protocols = [d2dcn.constants.commandProtocol.JSON_UDP, d2dcn.constants.commandProtocol.JSON_TCP, d2dcn.constants.commandProtocol.JSON_TCP_FRAMED]
+        for protocol in protocols:
+            self.assertTrue(test1.addServiceCommand(lambda args : args, "async " + protocol, api, api, d2dcnTest.category, protocol=protocol), "Error adding command")
+
+        writer = test1.addInfoWriter("async writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+
+
+        async def asyncTest():
+
+            # Concurrent calls
+            for protocol in protocols:
+                comands = await test2.getAvailableComands(name="async " + protocol, wait=5)
+                self.assertTrue(len(comands) > 0, "Not found command")
+
+                results = await asyncio.gather(*[comands[0].callAsync({"arg1": i}) for i in range(50)])
+                for i, result in enumerate(results):
+                    self.assertTrue(result.success, "Commnd should be success")
+                    self.assertTrue(result["arg1"] == i, "Response should match its request")
+
+
+            # Info updates
+            readers = await test2.getAvailableInfoReaders(name="async writer", wait=5)
+            self.assertTrue(len(readers) > 0, "Reader info element not found")
+
+            updates = test2.infoUpdates(readers)
+            writer.value = 10
+            async for reader in updates:
+                if reader.value == 10:
+                    break
+
+
+            # Discovery timeout
+            comands = await test2.getAvailableComands(name="async not found", wait=0.5)
+            self.assertTrue(len(comands) == 0, "Command should not be found")
+
+        asyncio.run(asyncio.wait_for(asyncTest(), 20))
+
+
+    def test11_commandWorkers(self):
+
+        test1 = d2dcn.d2d(service="test11_commandWorkers_A")
+        test2 = d2dcn.d2d(service="test11_commandWorkers_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+
+        state = {"active": 0, "max": 0}
+        state_mutex = threading.Lock()
+        def slowCommand(args):
+            with state_mutex:
+                state["active"] += 1
+                state["max"] = max(state["max"], state["active"])
+            time.sleep(0.2)
+            with state_mutex:
+                state["active"] -= 1
+            return args
+
+        def failCommand(args):
+            raise Exception("error")
+
+        protocol = d2dcn.constants.commandProtocol.JSON_TCP_FRAMED
+        self.assertTrue(test1.addServiceCommand(slowCommand, "serialized", api, api, d2dcnTest.category, protocol=protocol), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(slowCommand, "parallel", api, api, d2dcnTest.category, protocol=protocol, concurrency=4), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(failCommand, "fail", api, api, d2dcnTest.category, protocol=protocol), "Error adding command")
+
+        for name, expected in [("serialized", 1), ("parallel", 4)]:
+            comands = test2.getAvailableComands(name=name, wait=5)
+            self.assertTrue(len(comands) > 0, "Not found command")
+
+            state["max"] = 0
+            results = comands[0].callBatch([{"arg1": i} for i in range(8)])
+            for i, result in enumerate(results):
+                self.assertTrue(result.success, "Commnd should be success")
+                self.assertTrue(result["arg1"] == i, "Response should match its request")
+            self.assertTrue(state["max"] == expected, "Incorrect worker concurrency")
+
+        comands = test2.getAvailableComands(name="fail", wait=5)
+        self.assertTrue(len(comands) > 0, "Not found command")
+        result = comands[0].call({"arg1": 1})
+        self.assertTrue(result.error == d2dcn.constants.commandErrorMsg.EXCEPTION_ERROR, "Incorrect error")
+
+
+    def test12_udpCommandWorkers(self):
+
+        test1 = d2dcn.d2d(service="test12_udpCommandWorkers_A")
+        test2 = d2dcn.d2d(service="test12_udpCommandWorkers_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+
+        state = {"active": 0, "max": 0}
+        state_mutex = threading.Lock()
+        def slowCommand(args):
+            with state_mutex:
+                state["active"] += 1
+                state["max"] = max(state["max"], state["active"])
+            time.sleep(0.2)
+            with state_mutex:
+                state["active"] -= 1
+            return args
+
+        protocol = d2dcn.constants.commandProtocol.JSON_UDP
+        self.assertTrue(test1.addServiceCommand(slowCommand, "udp parallel", api, api, d2dcnTest.category, protocol=protocol, concurrency=4), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(slowCommand, "udp bounded", api, api, d2dcnTest.category, timeout=1, protocol=protocol, queue_size=1), "Error adding command")
+
+        comands = test2.getAvailableComands(name="udp parallel", wait=5)
+        self.assertTrue(len(comands) > 0, "Not found command")
+        results = comands[0].callBatch([{"arg1": i} for i in range(8)])
+        for i, result in enumerate(results):
+            self.assertTrue(result.success, "Commnd should be success")
+            self.assertTrue(result["arg1"] == i, "Response should match its request")
+        self.assertTrue(state["max"] == 4, "Incorrect worker concurrency")
+
+        stats = test1.getCommandQueueStats("udp parallel")
+        self.assertTrue(stats.workers == 4 and stats.dropped == 0, "Incorrect queue stats")
+        self.assertTrue(1 <= stats.max_depth <= 8 and stats.capacity == d2dcn.constants.COMMAND_QUEUE_SIZE, "Incorrect queue depth stats")
+
+        # Burst over queue size
+        comands = test2.getAvailableComands(name="udp bounded", wait=5)
+        self.assertTrue(len(comands) > 0, "Not found command")
+        results = comands[0].callBatch([{"arg1": i} for i in range(10)])
+        success = len([result for result in results if result.success])
+        stats = test1.getCommandQueueStats("udp bounded")
+        self.assertTrue(success > 0 and success < 10, "Some requests should be dropped")
+        self.assertTrue(stats.dropped == 10 - success, "Incorrect drop counter")
+        self.assertTrue(stats.max_depth == 1 and stats.capacity == 1, "Incorrect queue depth stats")
+        self.assertTrue(test1.getCommandQueueStats("not exists") == None, "Not found command should have no stats")
+
+
+    def test13_udpFragments(self):
+
+        test1 = d2dcn.d2d(service="test13_udpFragments_A")
+        test2 = d2dcn.d2d(service="test13_udpFragments_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.STRING)
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "big udp", api, api, d2dcnTest.category), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "big udp jumbo", api, api, d2dcnTest.category, mtu=9000), "Error adding command")
+
+        # Out of order fragments
+        msg = bytes(range(256)) * 10
+        fragments = d2dcn.fragmentBuffer.fragment(msg, 100)
+        self.assertTrue(len(fragments) > 1, "Message should be fragmented")
+        fragment_buffer = d2dcn.fragmentBuffer()
+        results = [fragment_buffer.push(fragment, "source") for fragment in reversed(fragments)]
+        self.assertTrue(results[:-1] == [None] * (len(fragments) - 1) and results[-1] == msg, "Incorrect reassembly")
+
+        # Incomplete messages are bounded per source and in total
+        for i in range(d2dcn.constants.FRAGMENT_MAX_SOURCE_PENDING + 10):
+            fragment_buffer.push(d2dcn.fragmentBuffer.fragment(msg, 100)[0], "source")
+        self.assertTrue(fragment_buffer.pending == d2dcn.constants.FRAGMENT_MAX_SOURCE_PENDING, "Incorrect per source limit")
+        for i in range(d2dcn.constants.FRAGMENT_MAX_PENDING + 10):
+            fragment_buffer.push(d2dcn.fragmentBuffer.fragment(msg, 100)[0], i)
+        self.assertTrue(fragment_buffer.pending == d2dcn.constants.FRAGMENT_MAX_PENDING, "Incorrect total limit")
+
+        # Oldest message is dropped first
+        first = d2dcn.fragmentBuffer.fragment(msg, 100)
+        fragment_buffer.push(first[0], "other")
+        for i in range(d2dcn.constants.FRAGMENT_MAX_PENDING):
+            fragment_buffer.push(d2dcn.fragmentBuffer.fragment(msg, 100)[0], i)
+        self.assertTrue([fragment_buffer.push(fragment, "other") for fragment in first[1:]][-1] == None, "Oldest message should be dropped")
+
+        for name, size, mtu in [("big udp", 5000, d2dcn.constants.MTU), ("big udp jumbo", 30000, 9000)]:
+            comands = test2.getAvailableComands(name=name, wait=5)
+            self.assertTrue(len(comands) > 0, "Not found command")
+            self.assertTrue(comands[0].mtu == (None if mtu == d2dcn.constants.MTU else mtu), "Incorrect command MTU")
+
+            arg = "".join(chr(ord("a") + i % 26) for i in range(size))
+            result = comands[0].call({"arg1": arg})
+            self.assertTrue(result.success, "Commnd should be success")
+            self.assertTrue(result["arg1"] == arg, "Response should match its request")
+
+            result = asyncio.run(comands[0].callAsync({"arg1": arg}))
+            self.assertTrue(result.success, "Commnd should be success")
+            self.assertTrue(result["arg1"] == arg, "Response should match its request")
+
+
+    def test14_argsValidator(self):
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+        api.add("arg2", d2dcn.constants.valueTypes.FLOAT_ARRAY, optional=True)
+
+        self.assertTrue(api.validate({"arg1": 1}), "Valid args")
+        self.assertTrue(api.validate({"arg1": 1, "arg2": []}), "Valid args")
+        self.assertTrue(api.validate({"arg1": 1, "arg2": [1.0, 2.0]}), "Valid args")
+        self.assertTrue(not api.validate({"arg1": True}), "Bool is not int")
+        self.assertTrue(not api.validate({"arg2": [1.0]}), "Missing mandatory arg")
+        self.assertTrue(not api.validate({"arg1": 1, "arg2": [1.0, 2]}), "Not homogeneous array")
+        self.assertTrue(not api.validate({"arg1": 1, "arg3": 1}), "Unknown arg")
+        self.assertTrue(not api.validate([1]), "Args should be a map")
+
+        # Same result as the generic type check
+        values = [True, 1, 1.5, "a", [], [True], [1, 2], [1.5], ["a"], [1, 1.5], [[1]], None, {}]
+        types = [d2dcn.constants.valueTypes.__dict__[name] for name in dir(d2dcn.constants.valueTypes) if not name.startswith("__")]
+        for value_type in types:
+            check = d2dcn.typeTools.compileTypeCheck(value_type)
+            for value in values:
+                self.assertTrue(check(value) == d2dcn.typeTools.checkFieldType(value, value_type), "Compiled check mismatch")
+
+
+        # Not validated command
+        test1 = d2dcn.d2d(service="test14_argsValidator_A")
+        test2 = d2dcn.d2d(service="test14_argsValidator_B")
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "trusted", api, api, d2dcnTest.category, validate=False), "Error adding command")
+
+        comands = test2.getAvailableComands(name="trusted", wait=5)
+        self.assertTrue(len(comands) > 0, "Not found command")
+        self.assertTrue(comands[0].params.validate({"arg1": 1}), "Discovered args should be validated")
+        self.assertTrue(comands[0].call({"arg3": "a"}).success, "Args should not be validated")
+
+
+    def test15_discoveryIndex(self):
+
+        index = d2dcn.discoveryIndex()
+        index.update("client1", "d2dcn/mac1/service1/command/cat1/name1", ["data1"])
+        index.update("client1", "d2dcn/mac1/service1/command/cat1/name2", ["data2"])
+        index.update("client2", "d2dcn/mac2/service2/info/cat1/name1", ["data3"])
+        index.update("client2", "d2dcn/mac1/service1/command/cat1/name1", ["data4"])
+
+        self.assertTrue(index.find("", "", "command", "", "name1") == [("d2dcn/mac1/service1/command/cat1/name1", ["data4"])], "Last updated client data expected")
+        self.assertTrue(len(index.find("", "service1", "command", "cat1", "")) == 2, "Incorrect lookup")
+        self.assertTrue(len(index.find("", "", "command", "", "name*")) == 2, "Incorrect wildcard lookup")
+        self.assertTrue(len(index.find("", "", "command", "", "name")) == 0, "Name should not be a prefix")
+
+        index.remove("client2", "d2dcn/mac1/service1/command/cat1/name1")
+        self.assertTrue(index.find("", "", "command", "", "name1") == [("d2dcn/mac1/service1/command/cat1/name1", ["data1"])], "Client data should remain")
+        index.remove("client1", "d2dcn/mac1/service1/command/cat1/name1")
+        self.assertTrue(len(index.find("", "", "command", "", "name1")) == 0, "Entry should be removed")
+
+
+        # Regex metacharacters in names
+        test1 = d2dcn.d2d(service="test15_discoveryIndex_A")
+        test2 = d2dcn.d2d(service="test15_discoveryIndex_B")
+
+        api = d2dcn.commandArgsDef()
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "a+b (c)", api, api, d2dcnTest.category), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "ab (c)", api, api, d2dcnTest.category), "Error adding command")
+
+        self.assertTrue(len(test2.getAvailableComands(name="ab (c)", wait=5)) == 1, "Not found command")
+        comands = test2.getAvailableComands(name="a+b (c)", wait=5)
+        self.assertTrue(len(comands) == 1 and comands[0].name == "a+b (c)", "Incorrect command found")
+
+        comands = test2.getAvailableComands(name="*b (c)", service="test15_discoveryIndex_A", wait=5)
+        self.assertTrue(len(comands) == 2, "Incorrect wildcard lookup")
+
+
+    def test16_discoveryWait(self):
+
+        test1 = d2dcn.d2d(service="test16_discoveryWait_A")
+        test2 = d2dcn.d2d(service="test16_discoveryWait_B")
+
+        api = d2dcn.commandArgsDef()
+        results = {}
+        def waitThread():
+            results["comands"] = test2.getAvailableComands(name="late command", wait=10)
+            results["time"] = time.time()
+
+        thread = threading.Thread(target=waitThread)
+        thread.start()
+        time.sleep(0.5)
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "late command", api, api, d2dcnTest.category), "Error adding command")
+        add_time = time.time()
+        thread.join()
+
+        self.assertTrue(len(results["comands"]) == 1, "Not found command")
+        self.assertTrue(results["time"] - add_time < 2, "Waiting call should return when the command is published")
+
+        start = time.time()
+        self.assertTrue(len(test2.getAvailableComands(name="never published", wait=0.5)) == 0, "Command should not be found")
+        self.assertTrue(time.time() - start >= 0.5, "Wait timeout should be respected")
+
+
+    def test17_descriptorCache(self):
+
+        calls = []
+        def parser(raw):
+            calls.append(raw)
+            return raw.upper()
+
+        cache = d2dcn.descriptorCache(2)
+        self.assertTrue(cache.get("path1", "a", parser) == "A" and cache.get("path1", "a", parser) == "A", "Incorrect cached value")
+        self.assertTrue(cache.get("path1", "b", parser) == "B", "Payload change should be parsed")
+        self.assertTrue(len(calls) == 2, "Cached descriptor should not be parsed again")
+        cache.get("path2", "a", parser)
+        self.assertTrue(len(cache) == 2, "Cache should be bounded")
+        cache.get("path1", "a", parser)
+        self.assertTrue(len(calls) == 4, "Least recently used entry should be evicted")
+
+
+        # Same schema, same definition object
+        test1 = d2dcn.d2d(service="test17_descriptorCache_A")
+        test2 = d2dcn.d2d(service="test17_descriptorCache_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "schema 1", api, api, d2dcnTest.category), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "schema 2", api, api, d2dcnTest.category), "Error adding command")
+
+        self.assertTrue(len(test2.getAvailableComands(name="schema 2", wait=5)) == 1, "Not found command")
+        comands = test2.getAvailableComands(name="schema *", service="test17_descriptorCache_A", wait=5)
+        self.assertTrue(len(comands) == 2, "Not found command")
+        self.assertTrue(comands[0].params is comands[1].params and comands[0].params is comands[0].response, "Schemas should be interned")
+        self.assertTrue(comands[0].call({"arg1": 1}).success, "Commnd should be success")
+
+
+    def test18_ownIPResolver(self):
+
+        resolver = d2dcn.ownIPResolver.get()
+        self.assertTrue(resolver is d2dcn.ownIPResolver.get(), "Resolver should be shared")
+
+        ip = resolver.resolve("127.0.0.1")
+        self.assertTrue(ip == "127.0.0.1", "Incorrect local address")
+
+        start = time.time()
+        for i in range(1000):
+            self.assertTrue(resolver.resolve("127.0.0.1") == ip, "Incorrect cached address")
+        self.assertTrue(time.time() - start < 1, "Address should be cached")
+
+        resolver.invalidate()
+        self.assertTrue(resolver.resolve("127.0.0.1") == ip, "Incorrect local address")
+        self.assertTrue(resolver.resolve("") == "", "Empty destination")
+
+
+    def test19_bulkRegistration(self):
+
+        test1 = d2dcn.d2d(service="test19_bulkRegistration_A")
+        test2 = d2dcn.d2d(service="test19_bulkRegistration_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+
+        commands = [{"cmdCallback": lambda args : args, "name": "bulk command " + str(i), "input_params": api, "output_params": api, "category": d2dcnTest.category} for i in range(3)]
+        self.assertTrue(test1.addServiceCommands(commands) == [True, True, True], "Error adding commands")
+        self.assertTrue(test1.addServiceCommands(commands) == [False, False, False], "Commands already added")
+
+        writers = test1.addInfoWriters([{"name": "bulk writer " + str(i), "valueType": d2dcn.constants.valueTypes.INT, "category": d2dcnTest.category} for i in range(3)])
+        self.assertTrue(len(writers) == 3 and None not in writers, "Error adding writers")
+
+
+        # Bundled entries are discovered as usual
+        self.assertTrue(len(test2.getAvailableComands(name="bulk command 2", wait=5)) == 1, "Not found command")
+        comands = test2.getAvailableComands(name="bulk command *", service="test19_bulkRegistration_A")
+        self.assertTrue(len(comands) == 3, "Not found commands")
+        for comand in comands:
+            self.assertTrue(comand.call({"arg1": 1}).success, "Commnd should be success")
+
+        self.assertTrue(len(test2.getAvailableInfoReaders(name="bulk writer 2", wait=5)) == 1, "Not found reader")
+        readers = test2.getAvailableInfoReaders(name="bulk writer *", service="test19_bulkRegistration_A")
+        self.assertTrue(len(readers) == 3, "Not found readers")
+
+        update_mutex = threading.Semaphore(0)
+        callback = lambda : update_mutex.release()
+        readers[0].addOnUpdateCallback(callback)
+        writers[int(readers[0].name[-1])].value = 10
+        while readers[0].value != 10:
+            self.assertTrue(update_mutex.acquire(timeout=5), "Writer value update not received")
+
+
+        # One bundle update toggles many commands
+        disabled = threading.Semaphore(0)
+        test2.onCommandUpdate = lambda mac, service, category, name : disabled.release()
+        self.assertTrue(test1.enableCommands({"bulk command 0": False, "bulk command 1": False}), "Error disabling commands")
+        for i in range(2):
+            self.assertTrue(disabled.acquire(timeout=5), "Command update not received")
+
+        for comand in comands:
+            self.assertTrue(comand.enable == (comand.name == "bulk command 2"), "Incorrect command enable")
+
+        self.assertTrue(test1.enableCommand("bulk command 0", True), "Error enabling command")
+        self.assertTrue(disabled.acquire(timeout=5), "Command update not received")
+        self.assertTrue(not disabled.acquire(timeout=0.5), "Only changed commands should be updated")
+
+
+    def test20_publishPolicy(self):
+
+        test1 = d2dcn.d2d(service="test20_publishPolicy_A")
+        test2 = d2dcn.d2d(service="test20_publishPolicy_B")
+
+        limited = test1.addInfoWriter("rate limited", d2dcn.constants.valueTypes.INT, d2dcnTest.category, max_rate=10)
+        deadband = test1.addInfoWriter("deadband", d2dcn.constants.valueTypes.FLOAT, d2dcnTest.category, deadband=1.0)
+        refreshed = test1.addInfoWriter("refreshed", d2dcn.constants.valueTypes.INT, d2dcnTest.category, refresh=0.2)
+
+        readers = {}
+        updates = {}
+        callbacks = []
+        for name in ["rate limited", "deadband", "refreshed"]:
+            found = test2.getAvailableInfoReaders(name=name, service="test20_publishPolicy_A", wait=5)
+            self.assertTrue(len(found) == 1, "Not found reader")
+            readers[name] = found[0]
+            updates[name] = threading.Semaphore(0)
+            callbacks.append(lambda name=name : updates[name].release())
+            readers[name].addOnUpdateCallback(callbacks[-1])
+
+        time.sleep(0.5)
+        for name in updates:
+            while updates[name].acquire(timeout=0):
+                pass
+
+
+        # Latest value is always published
+        for i in range(1, 101):
+            limited.value = i
+        time.sleep(0.5)
+        received = 0
+        while updates["rate limited"].acquire(timeout=0):
+            received += 1
+        self.assertTrue(received > 0 and received <= 3, "Updates should be coalesced")
+        self.assertTrue(readers["rate limited"].value == 100, "Latest value should be published")
+
+        # Only sent updates are counted
+        counters = test1.getMetrics()["counters"]["info.writer.updates"]
+        self.assertTrue(counters["/".join([limited.mac, limited.service, limited.name])] <= 3, "Coalesced updates should not be counted")
+
+
+        # Small changes are not published
+        deadband.value = 0.5
+        self.assertTrue(not updates["deadband"].acquire(timeout=0.5), "Change inside deadband")
+        deadband.value = 2.0
+        while readers["deadband"].value != 2.0:
+            self.assertTrue(updates["deadband"].acquire(timeout=5), "Change outside deadband")
+        counters = test1.getMetrics()["counters"]["info.writer.updates"]
+        self.assertTrue(counters["/".join([deadband.mac, deadband.service, deadband.name])] == 1, "Change inside deadband should not be counted")
+
+
+        # Periodic publish without changes
+        while updates["refreshed"].acquire(timeout=0):
+            pass
+        time.sleep(1)
+        received = 0
+        while updates["refreshed"].acquire(timeout=0):
+            received += 1
+        self.assertTrue(received >= 3, "Value should be refreshed")
+
+
+    def test21_infoFrames(self):
+
+        test1 = d2dcn.d2d(service="test21_infoFrames_A")
+        test2 = d2dcn.d2d(service="test21_infoFrames_B")
+
+        writers = [test1.addInfoWriter("frame writer " + str(i), d2dcn.constants.valueTypes.INT, d2dcnTest.category) for i in range(3)]
+        self.assertTrue(len(test2.getAvailableInfoReaders(name="frame writer 2", wait=5)) == 1, "Not found reader")
+        readers = sorted(test2.getAvailableInfoReaders(name="frame writer *", service="test21_infoFrames_A"), key=lambda reader : reader.name)
+        self.assertTrue(len(readers) == 3, "Not found readers")
+
+
+        # Every callback of a frame sees all the frame values
+        updates = threading.Semaphore(0)
+        seen = []
+        def callback():
+            seen.append([reader.value for reader in readers])
+            updates.release()
+
+        for reader in readers:
+            reader.addOnUpdateCallback(callback)
+
+        while None in [reader.value for reader in readers]:
+            self.assertTrue(updates.acquire(timeout=5), "Initial value not received")
+        seen.clear()
+
+        for expected in [1, 2]:
+            with test1.transaction():
+                for writer in writers:
+                    writer.value = expected
+
+            while len(seen) == 0 or seen[-1] != [expected] * 3:
+                self.assertTrue(updates.acquire(timeout=5), "Frame not received")
+
+        self.assertTrue(all(len(set(values)) == 1 for values in seen), "Frame values should be applied together")
+
+
+        # Values written within a publish cycle
+        test1.publishCycle = 0.05
+        for i in range(100):
+            for writer in writers:
+                writer.value = 100 + i
+
+        while [reader.value for reader in readers] != [199] * 3:
+            self.assertTrue(updates.acquire(timeout=5), "Frame not received")
+
+        test1.publishCycle = 0
+        writers[0].value = 1000
+        while readers[0].value != 1000:
+            self.assertTrue(updates.acquire(timeout=5), "Update not received")
+
+
+    def test22_readerHistory(self):
+
+        test1 = d2dcn.d2d(service="test22_readerHistory_A")
+        test2 = d2dcn.d2d(service="test22_readerHistory_B")
+
+        writer = test1.addInfoWriter("history writer", d2dcn.constants.valueTypes.FLOAT, d2dcnTest.category)
+        readers = test2.getAvailableInfoReaders(name="history writer", wait=5)
+        self.assertTrue(len(readers) == 1, "Not found reader")
+        reader = readers[0]
+        self.assertTrue(reader.history() == (None, None), "History should be disabled")
+
+        updates = threading.Semaphore(0)
+        callback = lambda : updates.release()
+        reader.addOnUpdateCallback(callback)
+        while reader.value == None:
+            self.assertTrue(updates.acquire(timeout=5), "Initial value not received")
+
+        reader.enableHistory(5)
+        start = time.time()
+        for i in range(1, 9):
+            writer.value = float(i)
+            while reader.value != float(i):
+                self.assertTrue(updates.acquire(timeout=5), "Writer value update not received")
+
+        times, values = reader.history()
+        self.assertTrue(values.typecode == "d" and list(values) == [4.0, 5.0, 6.0, 7.0, 8.0], "Incorrect history")
+        self.assertTrue(list(times) == sorted(times) and times[0] >= start, "Incorrect history timestamps")
+        self.assertTrue(list(reader.history(2)[1]) == [7.0, 8.0], "Incorrect last samples")
+        self.assertTrue(list(reader.history(start_time=times[3])[1]) == [7.0, 8.0], "Incorrect time window")
+        self.assertTrue(list(reader.history(start_time=times[1], end_time=times[2])[1]) == [5.0, 6.0], "Incorrect time window")
+
+        reader.disableHistory()
+        self.assertTrue(reader.history() == (None, None), "History should be disabled")
+
+
+    def test23_timestamps(self):
+
+        test1 = d2dcn.d2d(service="test23_timestamps_A")
+        test2 = d2dcn.d2d(service="test23_timestamps_B")
+
+        writer = test1.addInfoWriter("stamped writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+        self.assertTrue(writer.timestamp != None, "Writer timestamp not set")
+        readers = test2.getAvailableInfoReaders(name="stamped writer", wait=5)
+        self.assertTrue(len(readers) == 1, "Not found reader")
+        reader = readers[0]
+
+        updates = threading.Semaphore(0)
+        callback = lambda : updates.release()
+        reader.addOnUpdateCallback(callback)
+        while reader.value == None:
+            self.assertTrue(updates.acquire(timeout=5), "Initial value not received")
+
+        start = time.time()
+        writer.value = 7
+        while reader.value != 7:
+            self.assertTrue(updates.acquire(timeout=5), "Writer value update not received")
+
+        self.assertTrue(reader.publishTimestamp == writer.timestamp, "Incorrect publish timestamp")
+        self.assertTrue(start <= reader.publishTimestamp <= reader.receiveTimestamp <= time.time(), "Incorrect receive timestamp")
+
+
+        # Refreshes are stamped when sent
+        refreshed = test1.addInfoWriter("stamped refreshed writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category, refresh=0.2)
+        refreshed.value = 3
+        changed = refreshed.timestamp
+        readers = test2.getAvailableInfoReaders(name="stamped refreshed writer", wait=5)
+        self.assertTrue(len(readers) == 1, "Not found reader")
+        reader = readers[0]
+        reader.addOnUpdateCallback(callback)
+        start = time.time()
+        while reader.value != 3 or reader.publishTimestamp <= changed + 0.5:
+            self.assertTrue(updates.acquire(timeout=5) and time.time() - start < 5, "Refresh timestamp not updated")
+        self.assertTrue(reader.publishTimestamp <= reader.receiveTimestamp, "Incorrect refresh timestamp")
+
+
+    def test24_callbackDispatch(self):
+
+        test1 = d2dcn.d2d(service="test24_callbackDispatch_A")
+        test2 = d2dcn.d2d(service="test24_callbackDispatch_B")
+
+        writer = test1.addInfoWriter("dispatch writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+        readers = test2.getAvailableInfoReaders(name="dispatch writer", wait=5)
+        self.assertTrue(len(readers) == 1, "Not found reader")
+        reader = readers[0]
+
+        updates = threading.Semaphore(0)
+        release = threading.Event()
+        release.set()
+        def callback():
+            release.wait()
+            updates.release()
+        reader.addOnUpdateCallback(callback)
+        while reader.value == None:
+            self.assertTrue(updates.acquire(timeout=5), "Initial value not received")
+
+        # Blocked callback must not stop value updates
+        executor = d2dcn.commandDispatcher(2)
+        reader.configureCallbacks(executor, conflate=True)
+        release.clear()
+        for i in range(1, 11):
+            writer.value = i
+            time.sleep(0.05)
+        self.assertTrue(reader.value == 10, "Receive thread blocked by callback")
+
+        release.set()
+        self.assertTrue(updates.acquire(timeout=5), "Callback not executed")
+        self.assertTrue(updates.acquire(timeout=5), "Conflated callback not executed")
+        executed = 2
+        while updates.acquire(timeout=0.5):
+            executed += 1
+        self.assertTrue(executed <= 3, "Callbacks not conflated")
+        stats = reader.getCallbackStats()
+        self.assertTrue(stats.conflated >= 7 and stats.dropped == 0 and stats.depth == 0, "Incorrect conflation stats")
+
+        # Bounded queue drops notifications
+        reader.configureCallbacks(queue_size=3)
+        release.clear()
+        for i in range(11, 21):
+            writer.value = i
+            time.sleep(0.05)
+        self.assertTrue(reader.value == 20, "Receive thread blocked by callback")
+
+        release.set()
+        for i in range(4):
+            self.assertTrue(updates.acquire(timeout=5), "Queued callback not executed")
+        executed = 4
+        while updates.acquire(timeout=0.5):
+            executed += 1
+        self.assertTrue(executed <= 5, "Notifications not dropped")
+        stats = reader.getCallbackStats()
+        self.assertTrue(stats.dropped >= 5, "Incorrect dropped stats")
+        self.assertTrue(stats.max_depth == 3 and stats.capacity == 3, "Incorrect callback depth stats")
+
+
+    def test25_sequenceResync(self):
+
+        test1 = d2dcn.d2d(service="test25_sequenceResync_A")
+        test2 = d2dcn.d2d(service="test25_sequenceResync_B")
+
+        writer = test1.addInfoWriter("sequence writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+        readers = test2.getAvailableInfoReaders(name="sequence writer", wait=5)
+        self.assertTrue(len(readers) == 1, "Not found reader")
+        reader = readers[0]
+
+        updates = threading.Semaphore(0)
+        callback = lambda : updates.release()
+        reader.addOnUpdateCallback(callback)
+        for i in range(1, 4):
+            writer.value = i
+            while reader.value != i:
+                self.assertTrue(updates.acquire(timeout=5), "Writer value update not received")
+
+        stats = reader.getSequenceStats()
+        self.assertTrue(stats.lost == 0 and stats.reordered == 0, "Unexpected losses")
+
+        # Inject updates skipping and repeating sequence numbers
+        injector = d2dcn.mcast(d2dcn.constants.INFO_MULTICAST_GROUP, writer.updatePort)
+        def inject(sequence, value):
+            payload = d2dcn.constants.INFO_SEQUENCE.pack(sequence) + d2dcn.constants.INFO_TIMESTAMP.pack(time.time()) + d2dcn.typeTools.encode(value, writer.valueType, writer.protocol)
+            injector.send(d2dcn.constants.INFO_HEADER.pack(writer.id) + payload)
+
+        inject(stats.sequence + 3, 42)
+        while reader.value != 42:
+            self.assertTrue(updates.acquire(timeout=5), "Injected update not received")
+
+        stats = reader.getSequenceStats()
+        self.assertTrue(stats.lost == 2 and stats.resyncs == 1, "Lost updates not detected")
+
+        inject(stats.sequence - 1, 41)
+        start = time.time()
+        while reader.getSequenceStats().reordered == 0 and time.time() - start < 5:
+            time.sleep(0.05)
+
+        self.assertTrue(reader.getSequenceStats().reordered == 1, "Reordered update not detected")
+        self.assertTrue(reader.value == 42, "Reordered update applied")
+        injector.close()
+
+
+    def test26_bulkSnapshot(self):
+
+        test1 = d2dcn.d2d(service="test26_bulkSnapshot_A")
+        test2 = d2dcn.d2d(service="test26_bulkSnapshot_B")
+
+        writers = test1.addInfoWriters([{"name" : "snapshot writer " + str(i), "valueType" : d2dcn.constants.valueTypes.INT, "category" : d2dcnTest.category} for i in range(300)])
+        self.assertTrue(len(writers) == 300, "Writers not created")
+        for i, writer in enumerate(writers):
+            writer.value = i + 1
+
+        readers = []
+        start = time.time()
+        while len(readers) < 300 and time.time() - start < 10:
+            readers = test2.getAvailableInfoReaders(name="snapshot writer *", service="test26_bulkSnapshot_A", wait=5)
+
+        self.assertTrue(len(readers) == 300, "Not found readers")
+        start = time.time()
+        while None in [reader.value for reader in readers] and time.time() - start < 5:
+            time.sleep(0.05)
+
+        values = sorted(reader.value for reader in readers)
+        self.assertTrue(values == list(range(1, 301)), "Snapshot values not received")
+
+
+    def test27_lazyReaders(self):
+
+        test1 = d2dcn.d2d(service="test27_lazyReaders_A")
+        test2 = d2dcn.d2d(service="test27_lazyReaders_B")
+
+        writers = test1.addInfoWriters([{"name" : "lazy writer " + str(i), "valueType" : d2dcn.constants.valueTypes.INT, "category" : d2dcnTest.category} for i in range(20)])
+        for i, writer in enumerate(writers):
+            writer.value = i + 1
+
+        readers = test2.getAvailableInfoReaders(name="lazy writer *", service="test27_lazyReaders_A", wait=5)
+        self.assertTrue(len(readers) == 20, "Not found readers")
+        self.assertTrue(not any(reader.active for reader in readers), "Readers should not be active")
+
+        reader = [reader for reader in readers if reader.name == "lazy writer 4"][0]
+        start = time.time()
+        while reader.value != 5 and time.time() - start < 5:
+            time.sleep(0.05)
+
+        self.assertTrue(reader.value == 5, "Value not received on activation")
+        self.assertTrue(sum(reader.active for reader in readers) == 1, "Only used reader should be active")
+
+        # Idle reader parks and resumes on next access
+        reader.parkTime = 0.5
+        start = time.time()
+        while reader.active and time.time() - start < 5:
+            time.sleep(0.1)
+
+        self.assertFalse(reader.active, "Idle reader not parked")
+        writers[4].value = 50
+        start = time.time()
+        while reader.value != 50 and time.time() - start < 5:
+            time.sleep(0.05)
+
+        self.assertTrue(reader.value == 50 and reader.active, "Parked reader not resumed")
+
+
+    def test28_transportPool(self):
+
+        test1 = d2dcn.d2d(service="test28_transportPool_A")
+        test2 = d2dcn.d2d(service="test28_transportPool_B")
+        test3 = d2dcn.d2d(service="test28_transportPool_C")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+        protocol = d2dcn.constants.commandProtocol.JSON_TCP_FRAMED
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "pooled", api, api, d2dcnTest.category, protocol=protocol), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "preconnected", api, api, d2dcnTest.category, protocol=protocol), "Error adding command")
+
+        comands = test2.getAvailableComands(name="pooled", wait=5) + test3.getAvailableComands(name="pooled", wait=5)
+        self.assertTrue(len(comands) == 2 and comands[0] is not comands[1], "Not found commands")
+        self.assertFalse(comands[0].connected or comands[1].connected, "Sockets should be created on first call")
+
+        self.assertTrue(comands[0].call({"arg1" : 1}).success, "Command call failed")
+        self.assertTrue(comands[1].connected, "Connection not shared")
+        self.assertTrue(comands[1].call({"arg1" : 2})["arg1"] == 2, "Command call failed")
+
+        # Idle connections are closed and reopened on demand
+        pool = d2dcn.commandTransportPool.get()
+        pool.idleTime = 0.5
+        try:
+            start = time.time()
+            while comands[0].connected and time.time() - start < 5:
+                time.sleep(0.1)
+
+            self.assertFalse(comands[0].connected, "Idle connection not evicted")
+            self.assertTrue(comands[0].call({"arg1" : 3})["arg1"] == 3, "Command call failed after eviction")
+
+        finally:
+            pool.idleTime = d2dcn.constants.TRANSPORT_IDLE_TIME
+
+        comand = test2.getAvailableComands(name="preconnected", wait=5)[0]
+        comand.preconnect()
+        start = time.time()
+        while not comand.connected and time.time() - start < 5:
+            time.sleep(0.05)
+
+        self.assertTrue(comand.connected, "Command not preconnected")
+
+
+    def test29_metrics(self):
+
+        test1 = d2dcn.d2d(service="test29_metrics_A")
+        test2 = d2dcn.d2d(service="test29_metrics_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+        def failCommand(args):
+            raise Exception("error")
+
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "measured", api, api, d2dcnTest.category), "Error adding command")
+        self.assertTrue(test1.addServiceCommand(failCommand, "measured fail", api, api, d2dcnTest.category), "Error adding command")
+        writer = test1.addInfoWriter("measured writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+
+        comand = test2.getAvailableComands(name="measured", wait=5)[0]
+        fail_comand = test2.getAvailableComands(name="measured fail", wait=5)[0]
+        reader = test2.getAvailableInfoReaders(name="measured writer", wait=5)[0]
+
+        updates = threading.Semaphore(0)
+        callback = lambda : updates.release()
+        reader.addOnUpdateCallback(callback)
+        while reader.value == None:
+            self.assertTrue(updates.acquire(timeout=5), "Initial value not received")
+
+        for i in range(1, 4):
+            self.assertTrue(comand.call({"arg1" : i}).success, "Command call failed")
+            writer.value = i
+            while reader.value != i:
+                self.assertTrue(updates.acquire(timeout=5), "Writer value update not received")
+        self.assertFalse(fail_comand.call({"arg1" : 0}).success, "Command should fail")
+
+        metrics = test2.getMetrics()
+        self.assertTrue(metrics == json.loads(json.dumps(metrics)), "Metrics not exportable")
+
+        served = "/".join([test1.mac, "test29_metrics_A", "measured"])
+        called = "/".join([comand.mac, comand.service, comand.name])
+        written = "/".join([writer.mac, writer.service, writer.name])
+        read = "/".join([reader.mac, reader.service, reader.name])
+        self.assertTrue(metrics["counters"]["command.requests"][served] == 3, "Incorrect served request count")
+        self.assertTrue(metrics["counters"]["command.errors"][served.replace("measured", "measured fail") + "/" + d2dcn.constants.commandErrorMsg.EXCEPTION_ERROR] == 1, "Incorrect served error count")
+        self.assertTrue(metrics["histograms"]["command.latency"][served]["count"] == 3, "Incorrect served latency")
+        self.assertTrue(metrics["counters"]["command.calls"][called] == 3 and metrics["counters"]["command.timeouts"][called] == 0, "Incorrect call count")
+        self.assertTrue(metrics["counters"]["command.bytes_sent"][called] > 0 and metrics["counters"]["command.bytes_received"][called] > 0, "Incorrect call bytes")
+        self.assertTrue(sum(metrics["histograms"]["command.call_latency"][called]["buckets"].values()) == 3, "Incorrect call latency")
+        self.assertTrue(metrics["counters"]["info.writer.updates"][written] == 3 and metrics["counters"]["info.writer.bytes"][written] > 0, "Incorrect writer metrics")
+        self.assertTrue(metrics["counters"]["info.reader.updates"][read] >= 4 and metrics["counters"]["info.reader.bytes"][read] > 0, "Incorrect reader metrics")
+        self.assertTrue(metrics["histograms"]["info.reader.decode_time"][read]["count"] >= 4, "Incorrect decode time")
+        self.assertTrue(metrics["histograms"]["info.reader.callback_time"][read]["count"] >= 4, "Incorrect callback time")
+
+
+    def test30_failingHandler(self):
+
+        test1 = d2dcn.d2d(service="test30_failingHandler_A")
+        test2 = d2dcn.d2d(service="test30_failingHandler_B")
+
+        writer = test1.addInfoWriter("failing handler writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+        readers = test2.getAvailableInfoReaders(name="failing handler writer", wait=5)
+        self.assertTrue(len(readers) == 1, "Not found reader")
+        reader = readers[0]
+
+        # Handlers failing on apply and on notify share the receive thread
+        def failNotify():
+            raise Exception("error")
+
+        def failHandler(data, timestamp, reply):
+            raise Exception("error")
+
+        receiver = d2dcn.infoReceiver.get()
+        subscriptions = [receiver.subscribe(reader.ip, writer.requestPort, writer.updatePort, writer.id, handler) for handler in [failHandler, lambda data, timestamp, reply : failNotify]]
+
+        updates = threading.Semaphore(0)
+        callback = lambda : updates.release()
+        reader.addOnUpdateCallback(callback)
+        for i in range(1, 4):
+            writer.value = i
+            while reader.value != i:
+                self.assertTrue(updates.acquire(timeout=5), "Writer value update not received")
+
+        for subscription in subscriptions:
+            receiver.unsubscribe(subscription)
+
+
+    def test31_historyOverflow(self):
+
+        history = d2dcn.ringBuffer(3, d2dcn.constants.valueTypes.INT)
+        value = d2dcn.typeTools.decode(b"18446744073709551616", d2dcn.constants.valueTypes.INT, d2dcn.constants.infoProtocol.ASCII)
+        for i, sample in enumerate([1, value, 2, 3]):
+            history.append(float(i), sample)
+
+        times, values = history.last()
+        self.assertTrue(list(times) == [1.0, 2.0, 3.0] and list(values) == [value, 2, 3], "Incorrect history after overflow")
+
+
+    def test32_asyncWait(self):
+
+        test1 = d2dcn.d2d(service="test32_asyncWait_A")
+        test2 = d2dcn.asyncD2D(d2dcn.d2d(service="test32_asyncWait_B"))
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+        writer = test1.addInfoWriter("async wait writer", d2dcn.constants.valueTypes.INT, d2dcnTest.category)
+
+
+        async def asyncTest():
+
+            # Discovery wakes up on registration without blocking the loop
+            ticks = []
+            async def ticker():
+                while True:
+                    ticks.append(time.time())
+                    await asyncio.sleep(0.05)
+
+            tick_task = asyncio.create_task(ticker())
+            asyncio.get_running_loop().call_later(1, lambda : test1.addServiceCommand(lambda args : args, "async late", api, api, d2dcnTest.category))
+            comands = await test2.getAvailableComands(name="async late")
+            tick_task.cancel()
+            self.assertTrue(len(comands) == 1, "Late command not found")
+            self.assertTrue(len(ticks) >= 10, "Event loop blocked while waiting")
+
+            # Cancelled calls propagate the cancellation
+            call_task = asyncio.create_task(comands[0].callAsync({"arg1" : 1}))
+            await asyncio.sleep(0)
+            call_task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await call_task
+
+            # Bounded update stream keeps the latest updates and can be closed
+            readers = await test2.getAvailableInfoReaders(name="async wait writer", wait=5)
+            reader = readers[0]
+            while reader.value == None:
+                await asyncio.sleep(0.05)
+
+            updates = test2.infoUpdates(readers, 2)
+            for i in range(1, 6):
+                writer.value = i
+                while reader.value != i:
+                    await asyncio.sleep(0.01)
+            await asyncio.sleep(0.2)
+
+            updates.close()
+            received = [reader.value async for reader in updates]
+            self.assertTrue(len(received) <= 2, "Update stream not bounded")
+
+        asyncio.run(asyncio.wait_for(asyncTest(), 20))
+
+
+    def test33_snapshotRetry(self):
+
+        publisher = d2dcn.infoPublisher()
+        ip = d2dcn.ownIPResolver.get().resolve(d2dcn.constants.INFO_MULTICAST_GROUP)
+
+        # First request is not answered, the writer does not exist yet
+        reader = d2dcn.infoReader("mac", "test33_snapshotRetry", d2dcnTest.category, "retry writer", d2dcn.constants.valueTypes.INT, ip, publisher.requestPort, publisher.updatePort, 0)
+        self.assertTrue(reader.value == None, "Value should not be available")
+        time.sleep(0.2)
+        writer = d2dcn.infoWriter("mac", "test33_snapshotRetry", d2dcnTest.category, "retry writer", d2dcn.constants.valueTypes.INT, publisher)
+        self.assertTrue(writer.id == 0, "Unexpected writer id")
+
+        start = time.time()
+        while reader.value == None and time.time() - start < 5:
+            time.sleep(0.05)
+
+        self.assertTrue(reader.value == 0, "Missing value not requested again")
+
+
+    def test34_metricsLifecycle(self):
+
+        test1 = d2dcn.d2d(service="test34_metricsLifecycle_A")
+        test2 = d2dcn.d2d(service="test34_metricsLifecycle_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+        self.assertTrue(test1.addServiceCommand(lambda args : args, "async measured", api, api, d2dcnTest.category), "Error adding command")
+        comand = test2.getAvailableComands(name="async measured", wait=5)[0]
+        self.assertTrue(asyncio.run(comand.callAsync({"arg1" : 1})).success, "Async command call failed")
+
+        metrics = d2dcn.metricsRegistry.get()
+        called = "/".join([comand.mac, comand.service, comand.name])
+        counters = metrics.snapshot()["counters"]
+        self.assertTrue(counters["command.bytes_sent"][called] > 0 and counters["command.bytes_received"][called] > 0, "Incorrect async call bytes")
+
+        # Shards from finished threads are folded, not lost
+        shards = metrics.shards
+        threads = [threading.Thread(target=metrics.count, args=("test34.count", ("label",), 2)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(metrics.shards < shards + len(threads), "Dead thread shards not retired")
+        self.assertTrue(metrics.snapshot()["counters"]["test34.count"]["label"] == 40, "Retired shard values lost")
+
+
+    def test35_jsonBufferResync(self):
+
+        json_buffer = d2dcn.jsonBuffer()
+        def pop(data):
+            json_buffer.push(data.encode())
+            msgs = []
+            msg = json_buffer.pop()
+            while msg != None:
+                msgs.append(msg)
+                msg = json_buffer.pop()
+            return msgs
+
+        self.assertTrue(pop('{"a":1}{"b":"}\\"{"}') == ['{"a":1}', '{"b":"}\\"{"}'], "Incorrect split")
+        self.assertTrue(pop('{"c":[1,{"d"') == [] and pop(':2}]}') == ['{"c":[1,{"d":2}]}'], "Incomplete object not waited")
+        self.assertTrue(pop('garbage {x {"e":1}') == ['{"e":1}'], "Invalid object not discarded")
+        self.assertTrue(pop('{"f":1') == [] and pop('{"g":2}') == ['{"g":2}'], "Truncated object not discarded")
+
+
+    def test36_oversizedFrame(self):
+
+        listener = d2dcn.tcpListener()
+        client = d2dcn.tcpClient("127.0.0.1", listener.port)
+        self.assertTrue(client.connect(), "Client not connected")
+        connection = listener.waitConnection(5)
+        self.assertTrue(connection != None, "Connection not accepted")
+
+        # Frames within the limit are accepted
+        self.assertTrue(client.sendFrame("{}"), "Frame not sent")
+        self.assertTrue(connection.readFrame(5) == b"{}", "Frame not received")
+
+        # A corrupted header closes the connection on both ends
+        self.assertTrue(client.send(d2dcn.constants.FRAME_HEADER.pack(d2dcn.constants.MAX_FRAME_SIZE + 1)), "Header not sent")
+        self.assertTrue(connection.readFrame(5) == None and not connection.isConnected(), "Oversized frame accepted")
+        self.assertTrue(client.readFrame(5) == None and not client.connected, "Connection not closed")
+        listener.close()
+
+
+    def test37_publishRollback(self):
+
+        test1 = d2dcn.d2d(service="test37_publishRollback_A")
+        test2 = d2dcn.d2d(service="test37_publishRollback_B")
+
+        api = d2dcn.commandArgsDef()
+        api.add("arg1", d2dcn.constants.valueTypes.INT)
+        commands = [{"cmdCallback": lambda args : args, "name": "rollback command " + str(i), "input_params": api, "output_params": api, "category": d2dcnTest.category} for i in range(2)]
+
+        # Failed publish leaves nothing registered
+        shared_table = test1._d2d__shared_table
+        update = shared_table.updateTableEntry
+        published = []
+        shared_table.updateTableEntry = lambda path, entry : False
+        self.assertTrue(test1.addServiceCommands(commands) == [False, False], "Publish should fail")
+        self.assertTrue(test1.getCommandQueueStats("rollback command 0") == None, "Command not rolled back")
+        self.assertTrue(len(test1._d2d__threads) == 0, "Listener thread not released")
+
+        shared_table.updateTableEntry = lambda path, entry : published.append(path) or update(path, entry)
+        self.assertTrue(test1.addServiceCommands(commands) == [True, True], "Error adding commands after rollback")
+        comands = test2.getAvailableComands(name="rollback command *", wait=5)
+        self.assertTrue(len(comands) > 0, "Not found command")
+        self.assertTrue(comands[0].call({"arg1": 1}).success, "Commnd should be success")
+
+        # Single toggles leave the bundle once and then are published alone
+        del published[:]
+        self.assertTrue(test1.enableCommand("rollback command 0", False), "Error disabling command")
+        self.assertTrue(len(published) == 2, "Entry should leave its bundle")
+        del published[:]
+        self.assertTrue(test1.enableCommand("rollback command 0", True), "Error enabling command")
+        self.assertTrue(len(published) == 1, "Bundle should not be published again")
+
+        # Failed toggles keep the published state
+        shared_table.updateTableEntry = lambda path, entry : False
+        self.assertFalse(test1.enableCommand("rollback command 0", False), "Publish should fail")
+        self.assertFalse(test1.enableCommands({"rollback command 1": False}), "Publish should fail")
+        shared_table.updateTableEntry = update
+        service_container = test1._d2d__service_container
+        self.assertTrue(all(service_container["rollback command " + str(i)].map[d2dcn.constants.commandField.ENABLE] for i in range(2)), "Enable not restored")
+
+        # Big batches are split in bounded bundles, a failed bundle only rolls back its own entries
+        sizes = {}
+        def failSecondBundle(path, entry):
+            sizes[path] = len(entry[0])
+            return len(sizes) != 2 and update(path, entry)
+
+        shared_table.updateTableEntry = failSecondBundle
+        commands = [{"cmdCallback": lambda args : args, "name": "bundled command " + str(i), "input_params": api, "output_params": api, "category": d2dcnTest.category} for i in range(30)]
+        results = test1.addServiceCommands(commands)
+        shared_table.updateTableEntry = update
+        self.assertTrue(len(sizes) > 2 and max(sizes.values()) <= d2dcn.constants.BUNDLE_MAX_SIZE, "Bundles should be bounded")
+        self.assertTrue(True in results and False in results, "Only the failed bundle should be rolled back")
+        self.assertTrue(all((test1.getCommandQueueStats(command["name"]) != None) == result for command, result in zip(commands, results)), "Incorrect rollback")
+        self.assertTrue(test1.addServiceCommands(commands) == [not result for result in results], "Rolled back commands should be added again")
+
+        comands = test2.getAvailableComands(name="rollback command *", service="test37_publishRollback_A")
+        start = time.time()
+        while not all(comand.enable for comand in comands) and time.time() - start < 5:
+            time.sleep(0.05)
+
+        self.assertTrue(len(comands) == 2 and all(comand.enable for comand in comands), "Incorrect command state")
+
+
+    def test38_atomicTransaction(self):
+
+        publisher = d2dcn.infoPublisher()
+        ip = d2dcn.ownIPResolver.get().resolve(d2dcn.constants.INFO_MULTICAST_GROUP)
+        writers = [d2dcn.infoWriter("mac", "test38_atomicTransaction", d2dcnTest.category, "atomic writer " + str(i), d2dcn.constants.valueTypes.STRING, publisher) for i in range(2)]
+        readers = [d2dcn.infoReader("mac", "test38_atomicTransaction", d2dcnTest.category, "atomic writer " + str(i), d2dcn.constants.valueTypes.STRING, ip, publisher.requestPort, publisher.updatePort, writers[i].id) for i in range(2)]
+
+        updates = threading.Semaphore(0)
+        seen = []
+        def callback():
+            seen.append(d2dcn.infoReader.values(readers))
+            updates.release()
+
+        for reader in readers:
+            reader.addOnUpdateCallback(callback)
+
+        while d2dcn.infoReader.values(readers) != ["", ""]:
+            self.assertTrue(updates.acquire(timeout=5), "Initial value not received")
+        while updates.acquire(timeout=0.2):
+            pass
+
+
+        # Concurrent reads and callbacks never mix transactions
+        mixed = []
+        done = threading.Event()
+        def poll():
+            while not done.is_set():
+                values = d2dcn.infoReader.values(readers)
+                if values[0] != values[1]:
+                    mixed.append(values)
+
+        thread = threading.Thread(target=poll)
+        thread.start()
+
+        # Values bigger than half a frame split every transaction in two frames
+        try:
+            for i in range(10):
+                expected = str(i) * (d2dcn.constants.INFO_FRAME_SIZE // 2)
+                publisher.begin()
+                for writer in writers:
+                    writer.value = expected
+                publisher.end()
+
+                while d2dcn.infoReader.values(readers) != [expected, expected]:
+                    self.assertTrue(updates.acquire(timeout=5), "Transaction not received")
+
+        finally:
+            done.set()
+            thread.join()
+
+        self.assertTrue(len(mixed) == 0, "Readers should not see mixed transactions")
+        self.assertTrue(all(values[0] == values[1] for values in seen), "Callbacks should not see mixed transactions")
+
+
+        # A transaction split in two frames is applied when both are received
+        sender = d2dcn.mcast(d2dcn.constants.INFO_MULTICAST_GROUP, publisher.updatePort)
+        def part(index, reader, value):
+            payload = d2dcn.constants.INFO_SEQUENCE.pack(reader.getSequenceStats().sequence + 1) + d2dcn.constants.INFO_TIMESTAMP.pack(time.time()) + d2dcn.typeTools.encode(value, reader.valueType, reader.protocol)
+            return d2dcn.constants.INFO_HEADER.pack(d2dcn.constants.INFO_FRAME_ID) + d2dcn.constants.INFO_FRAME_PART.pack(1000, index, 2) + d2dcn.constants.INFO_FRAME_ENTRY.pack(writers[index].id, len(payload)) + payload
+
+        while updates.acquire(timeout=0.2):
+            pass
+
+        self.assertTrue(sender.send(part(1, readers[1], "part")), "Part not sent")
+        self.assertFalse(updates.acquire(timeout=0.5), "Incomplete transaction applied")
+        self.assertTrue(d2dcn.infoReader.values(readers) == [expected, expected], "Incomplete transaction applied")
+
+        self.assertTrue(sender.send(part(0, readers[0], "part")), "Part not sent")
+        while d2dcn.infoReader.values(readers) != ["part", "part"]:
+            self.assertTrue(updates.acquire(timeout=5), "Transaction not received")
+
+        sender.close()
+
+
+    def test39_slowCallback(self):
+
+        publisher = d2dcn.infoPublisher()
+        ip = d2dcn.ownIPResolver.get().resolve(d2dcn.constants.INFO_MULTICAST_GROUP)
+        writers = [d2dcn.infoWriter("mac", "test39_slowCallback", d2dcnTest.category, "slow writer " + str(i), d2dcn.constants.valueTypes.INT, publisher) for i in range(2)]
+        readers = [d2dcn.infoReader("mac", "test39_slowCallback", d2dcnTest.category, "slow writer " + str(i), d2dcn.constants.valueTypes.INT, ip, publisher.requestPort, publisher.updatePort, writers[i].id) for i in range(2)]
+
+        release = threading.Event()
+        blocked = threading.Event()
+        def slowCallback():
+            if readers[0].value == 1:
+                blocked.set()
+                release.wait(5)
+
+        updates = threading.Semaphore(0)
+        callback = lambda : updates.release()
+        readers[0].addOnUpdateCallback(slowCallback)
+        readers[1].addOnUpdateCallback(callback)
+        while readers[0].value == None or readers[1].value == None:
+            time.sleep(0.05)
+
+        # A blocked callback does not delay callbacks of other readers
+        try:
+            writers[0].value = 1
+            self.assertTrue(blocked.wait(5), "Slow callback not called")
+            while updates.acquire(timeout=0.2):
+                pass
+
+            writers[1].value = 1
+            self.assertTrue(updates.acquire(timeout=1), "Callback delayed by another reader")
+            self.assertTrue(readers[1].value == 1, "Incorrect value")
+
+        finally:
+            release.set()
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file